@@ -25,6 +25,13 @@ config.set_main_option("sqlalchemy.url", database_url)
 # target_metadata = mymodel.Base.metadata
 target_metadata = None
 
+# Padrão obrigatório para migrations em tabelas populadas:
+# - `op.execute("SET lock_timeout = '3s'")` no início do upgrade(), para
+#   abortar em vez de bloquear escritas esperando por lock;
+# - índices criados com `postgresql_concurrently=True` dentro de
+#   `with op.get_context().autocommit_block():` (CONCURRENTLY não roda
+#   em transação). Ver 001_initial_schema.py.
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
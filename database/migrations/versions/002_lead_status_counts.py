@@ -0,0 +1,34 @@
+"""Create lead_status_counts materialized view
+
+Revision ID: 002_lead_status_counts
+Revises: 001_initial
+Create Date: 2024-02-01 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002_lead_status_counts'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("SET lock_timeout = '3s'")
+
+    # Contagem de leads por status, atualizada pela app a cada minuto
+    # (src/services/stats_refresher.py)
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS lead_status_counts AS
+        SELECT status, count(*) AS n
+        FROM leads
+        GROUP BY status
+    """)
+
+    # Índice único é obrigatório para REFRESH ... CONCURRENTLY
+    op.create_index('idx_lead_status_counts_status', 'lead_status_counts', ['status'], unique=True)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS lead_status_counts")
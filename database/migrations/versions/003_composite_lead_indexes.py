@@ -0,0 +1,34 @@
+"""Composite (lead_id, timestamp) indexes for per-lead history
+
+Revision ID: 003_composite_lead_indexes
+Revises: 002_lead_status_counts
+Create Date: 2024-02-05 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_composite_lead_indexes'
+down_revision = '002_lead_status_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("SET lock_timeout = '3s'")
+
+    # WHERE lead_id = ? ORDER BY timestamp percorre o índice já ordenado;
+    # os índices só em lead_id ficam redundantes (prefixo do composto)
+    with op.get_context().autocommit_block():
+        op.create_index('idx_conversations_lead_timestamp', 'conversations', ['lead_id', 'timestamp'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_schedulings_lead_data_reuniao', 'schedulings', ['lead_id', 'data_reuniao'], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_conversations_lead_id', table_name='conversations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_schedulings_lead_id', table_name='schedulings', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_conversations_lead_id', 'conversations', ['lead_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_schedulings_lead_id', 'schedulings', ['lead_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('idx_conversations_lead_timestamp', table_name='conversations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_schedulings_lead_data_reuniao', table_name='schedulings', postgresql_concurrently=True, if_exists=True)
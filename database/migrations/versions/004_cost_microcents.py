@@ -0,0 +1,42 @@
+"""Store conversations.custo_estimado in micro-cents
+
+Revision ID: 004_cost_microcents
+Revises: 003_composite_lead_indexes
+Create Date: 2024-02-10 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_cost_microcents'
+down_revision = '003_composite_lead_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("SET lock_timeout = '3s'")
+
+    # Centavos -> micro-centavos (10^-8 USD); BIGINT para as somas/valores maiores
+    op.alter_column(
+        'conversations',
+        'custo_estimado',
+        type_=sa.BigInteger(),
+        existing_type=sa.Integer(),
+        existing_nullable=True,
+        postgresql_using='custo_estimado::bigint * 1000000',
+    )
+
+
+def downgrade() -> None:
+    op.execute("SET lock_timeout = '3s'")
+
+    op.alter_column(
+        'conversations',
+        'custo_estimado',
+        type_=sa.Integer(),
+        existing_type=sa.BigInteger(),
+        existing_nullable=True,
+        postgresql_using='(custo_estimado / 1000000)::integer',
+    )
@@ -8,10 +8,12 @@ Uso:
 """
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 
@@ -26,39 +28,105 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
 
+# Cache em disco do uso diário
+USAGE_CACHE_DIR = Path("logs/openai_usage_cache")
+TODAY_CACHE_TTL_SECONDS = 300
+
+# Sessão HTTP reutilizada (keep-alive entre as consultas diárias),
+# com retry e backoff para rate limit e erros transitórios
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    ),
+))
+
+
+def fetch_day(day: date):
+    """
+    Consulta API de usage da OpenAI para um único dia.
+
+    Args:
+        day: Dia a consultar
+
+    Returns:
+        dict com informações de uso do dia ou None em caso de erro
+    """
+    headers = {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+    url = f"https://api.openai.com/v1/usage?date={day.isoformat()}"
+
+    response = _SESSION.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+
+    return response.json()
+
+
+def get_day_usage(day: date):
+    """
+    Retorna uso de um dia, usando cache em disco.
+
+    Dias passados são buscados uma vez e nunca expiram; o dia atual é
+    rebuscado quando o cache tem mais de TODAY_CACHE_TTL_SECONDS.
+
+    Args:
+        day: Dia a consultar
+
+    Returns:
+        dict com informações de uso do dia
+    """
+    cache_file = USAGE_CACHE_DIR / f"{day.isoformat()}.json"
+
+    if cache_file.exists():
+        cached_at = datetime.fromtimestamp(cache_file.stat().st_mtime)
+        day_end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+
+        # Cache gravado após o fim do dia é definitivo
+        if cached_at >= day_end:
+            return json.loads(cache_file.read_text())
+
+        # Dia atual (ou gravado antes do fim do dia): TTL curto
+        if day == date.today() and (datetime.now() - cached_at).total_seconds() < TODAY_CACHE_TTL_SECONDS:
+            return json.loads(cache_file.read_text())
+
+    usage = fetch_day(day)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps(usage))
+
+    return usage
+
 
 def get_openai_usage():
     """
-    Consulta API de usage da OpenAI.
+    Consulta API de usage da OpenAI para o mês atual.
 
     Returns:
-        dict com informações de uso
+        dict com informações de uso (chave "data" com os registros de todos os dias)
     """
     if not OPENAI_API_KEY:
         print("❌ Variável OPENAI_API_KEY não configurada")
         return None
 
     try:
-        # Calcula data do início do mês
-        today = datetime.now()
-        start_of_month = today.replace(day=1)
-
-        # Formata datas para query string
-        start_date = start_of_month.strftime("%Y-%m-%d")
-        end_date = today.strftime("%Y-%m-%d")
-
-        # Faz request para OpenAI API
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        # Do início do mês até hoje
+        today = date.today()
+        day = today.replace(day=1)
 
-        url = f"https://api.openai.com/v1/usage?start_date={start_date}&end_date={end_date}"
+        usage_data = []
+        while day <= today:
+            usage_data.extend(get_day_usage(day).get("data", []))
+            day += timedelta(days=1)
 
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        return response.json()
+        return {"data": usage_data}
 
     except requests.exceptions.RequestException as e:
         print(f"❌ Erro ao consultar OpenAI API: {e}")
@@ -208,8 +276,8 @@ def check_usage():
     else:
         print(f"✅ Dentro do limite. Continuar monitorando.")
 
-    # Salva log localmente
-    log_file = Path("logs/openai_usage.json")
+    # Salva log localmente (JSON Lines: uma entrada por linha)
+    log_file = Path("logs/openai_usage.jsonl")
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
     log_entry = {
@@ -219,18 +287,10 @@ def check_usage():
         "percentage": percentage,
     }
 
-    # Append ao arquivo de log
+    # Append ao arquivo de log, sem reler o histórico
     try:
-        if log_file.exists():
-            with open(log_file, "r") as f:
-                logs = json.load(f)
-        else:
-            logs = []
-
-        logs.append(log_entry)
-
-        with open(log_file, "w") as f:
-            json.dump(logs, f, indent=2)
+        with log_file.open("a") as f:
+            f.write(json.dumps(log_entry, separators=(",", ":")) + "\n")
 
         print(f"✅ Log salvo em {log_file}")
 
@@ -2,9 +2,14 @@
 Rotas administrativas.
 Endpoints para monitoramento e controle da aplicação.
 """
-from flask import jsonify, g, current_app
+from flask import jsonify, g, current_app, request, Response, stream_with_context
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
+import time
+import uuid
+from types import MappingProxyType
+from sqlalchemy import func, and_, tuple_, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 from pydantic import ValidationError
 
 from src.api import admin_bp
@@ -12,65 +17,116 @@ from src.config import settings
 from src.models.lead import Lead, LeadStatus
 from src.models.conversation import Conversation
 from src.models.scheduling import Scheduling, SchedulingStatus
-from src.schemas.payloads import ErrorResponse
 from src.utils.logging import get_logger
+from src.utils.pricing import MICROCENTS_PER_USD
 
 
 logger = get_logger(__name__)
 
+# Templates de erro (timestamp e request_id são adicionados por request)
+_ERR_USAGE_STATS = {"error": "internal_error", "code": 500, "message": "Erro ao buscar estatísticas"}
+_ERR_LIST_LEADS = {"error": "internal_error", "code": 500, "message": "Erro ao listar leads"}
+_ERR_LEAD_DETAIL = {"error": "internal_error", "code": 500, "message": "Erro ao buscar detalhes do lead"}
+
+# Lookup de status por nome (case-insensitive), sem exceção em input inválido
+_STATUS_MAP = MappingProxyType({m.name.lower(): m for m in LeadStatus})
+
+# Offset máximo em /leads; páginas mais profundas usam cursor (keyset)
+MAX_OFFSET = 1000
+
+# Cache in-process do payload de /usage (por worker)
+_USAGE_CACHE = {"ts": 0.0, "payload": None}
+
+
+def _get_status_breakdown(db) -> dict:
+    """
+    Contagem de leads por status.
+
+    No Postgres lê a view materializada `lead_status_counts` (atualizada a
+    cada minuto); sem a view, agrega direto na tabela de leads.
+    """
+    if db.engine.dialect.name == "postgresql" and settings.lead_status_counts_refresh_seconds:
+        try:
+            rows = db.session.execute(text("SELECT status, n FROM lead_status_counts")).all()
+            return {status: n for status, n in rows}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.warning("lead_status_counts_unavailable", error=str(e))
+
+    status_counts = db.session.query(
+        Lead.status,
+        func.count(Lead.id)
+    ).group_by(Lead.status).all()
+
+    return {status.value: count for status, count in status_counts}
+
 
 @admin_bp.route("/usage", methods=["GET"])
 def get_usage_stats():
     """
     Retorna estatísticas de uso (leads, conversas, custos).
 
+    O payload é cacheado por `usage_cache_ttl_seconds` para que refreshes
+    em rajada do dashboard não repitam os agregados no banco.
+
+    Query params:
+    - fresh: Se "1", ignora o cache e recalcula
+
     Returns:
-        JSON com estatísticas
+        JSON com estatísticas (header X-Cache: HIT/MISS)
     """
 
     try:
+        cached = _USAGE_CACHE["payload"]
+        if (
+            cached is not None
+            and request.args.get("fresh") != "1"
+            and time.monotonic() - _USAGE_CACHE["ts"] < settings.usage_cache_ttl_seconds
+        ):
+            response = jsonify(cached)
+            response.headers["X-Cache"] = "HIT"
+            return response, 200
+
         db = current_app.extensions.get("sqlalchemy")
         if not db:
             return jsonify({"error": "Database not available"}), 500
 
-        # Estatísticas de leads
-        total_leads = db.session.query(func.count(Lead.id)).scalar() or 0
-        new_leads_24h = db.session.query(func.count(Lead.id)).filter(
-            Lead.created_at >= datetime.utcnow() - timedelta(hours=24)
-        ).scalar() or 0
+        # Colunas são timestamp sem fuso, gravadas em UTC
+        now = g.now.replace(tzinfo=None)
 
-        # Estatísticas por status
-        status_counts = db.session.query(
-            Lead.status,
-            func.count(Lead.id)
-        ).group_by(Lead.status).all()
+        # Estatísticas de leads (uma única query com agregados filtrados)
+        total_leads, new_leads_24h = db.session.query(
+            func.count(Lead.id),
+            func.count(Lead.id).filter(Lead.created_at >= now - timedelta(hours=24)),
+        ).one()
 
-        status_breakdown = {
-            str(status): count for status, count in status_counts
-        }
+        # Estatísticas por status
+        status_breakdown = _get_status_breakdown(db)
 
         # Estatísticas de conversas
-        total_conversations = db.session.query(func.count(Conversation.id)).scalar() or 0
-        total_tokens = db.session.query(func.sum(Conversation.tokens_total)).scalar() or 0
-        total_cost_cents = db.session.query(func.sum(Conversation.custo_estimado)).scalar() or 0
-        total_cost_usd = total_cost_cents / 100 if total_cost_cents else 0
+        total_conversations, total_tokens, total_cost_microcents, avg_latency_ms = db.session.query(
+            func.count(Conversation.id),
+            func.sum(Conversation.tokens_total),
+            func.sum(Conversation.custo_estimado),
+            func.avg(Conversation.tempo_resposta_ms),
+        ).one()
+        total_tokens = total_tokens or 0
+        total_cost_usd = total_cost_microcents / MICROCENTS_PER_USD if total_cost_microcents else 0
+        avg_latency_ms = avg_latency_ms or 0
 
         # Estatísticas de agendamentos
-        total_schedulings = db.session.query(func.count(Scheduling.id)).scalar() or 0
-        scheduled_upcoming = db.session.query(func.count(Scheduling.id)).filter(
-            and_(
-                Scheduling.status == SchedulingStatus.AGENDADO,
-                Scheduling.data_reuniao > datetime.utcnow()
-            )
-        ).scalar() or 0
-
-        # Latência média
-        avg_latency_ms = db.session.query(
-            func.avg(Conversation.tempo_resposta_ms)
-        ).scalar() or 0
-
-        return jsonify({
-            "timestamp": datetime.utcnow().isoformat(),
+        total_schedulings, scheduled_upcoming = db.session.query(
+            func.count(Scheduling.id),
+            func.count(Scheduling.id).filter(
+                and_(
+                    Scheduling.status == SchedulingStatus.AGENDADO,
+                    Scheduling.data_reuniao > now,
+                )
+            ),
+        ).one()
+
+        payload = {
+            "timestamp": g.now.isoformat(),
             "leads": {
                 "total": total_leads,
                 "new_24h": new_leads_24h,
@@ -91,17 +147,22 @@ def get_usage_stats():
                 "cost_current": round(total_cost_usd, 4),
                 "cost_percentage": round((total_cost_usd / settings.openai_cost_limit_monthly * 100), 1) if settings.openai_cost_limit_monthly else 0,
             },
-        }), 200
+        }
+
+        _USAGE_CACHE["payload"] = payload
+        _USAGE_CACHE["ts"] = time.monotonic()
+
+        response = jsonify(payload)
+        response.headers["X-Cache"] = "MISS"
+        return response, 200
 
     except Exception as e:
         logger.error("usage_stats_error", error=str(e), request_id=g.request_id)
-        return jsonify(ErrorResponse(
-            error="internal_error",
-            code=500,
-            message="Erro ao buscar estatísticas",
-            timestamp=datetime.utcnow(),
-            request_id=g.request_id,
-        ).model_dump()), 500
+        return jsonify({
+            **_ERR_USAGE_STATS,
+            "timestamp": g.now.isoformat(),
+            "request_id": g.request_id,
+        }), 500
 
 
 @admin_bp.route("/leads", methods=["GET"])
@@ -109,18 +170,21 @@ def get_leads():
     """
     Lista todos os leads com filtros opcionais.
 
+    Paginação por cursor (keyset) em (created_at, id): passe os valores de
+    `next_cursor` da página anterior. O offset continua aceito para páginas
+    rasas (offset < MAX_OFFSET).
+
     Query params:
     - status: Filtrar por status
     - limit: Número máximo de resultados (padrão 20)
+    - after_created_at / after_id: Cursor da página anterior
     - offset: Offset para paginação (padrão 0)
 
     Returns:
-        JSON com lista de leads
+        JSON com lista de leads e next_cursor (None na última página)
     """
 
     try:
-        from flask import request
-
         db = current_app.extensions.get("sqlalchemy")
         if not db:
             return jsonify({"error": "Database not available"}), 500
@@ -129,39 +193,83 @@ def get_leads():
         status_filter = request.args.get("status")
         limit = int(request.args.get("limit", 20))
         offset = int(request.args.get("offset", 0))
+        after_created_at = request.args.get("after_created_at")
+        after_id = request.args.get("after_id")
+        use_cursor = bool(after_created_at or after_id)
 
         # Query
         query = db.session.query(Lead)
 
         if status_filter:
-            try:
-                status_enum = LeadStatus[status_filter.upper()]
-                query = query.filter(Lead.status == status_enum)
-            except KeyError:
+            status_enum = _STATUS_MAP.get(status_filter.lower())
+            if status_enum is None:
                 return jsonify({"error": f"Status inválido: {status_filter}"}), 400
+            query = query.filter(Lead.status == status_enum)
 
-        # Contar total
-        total = query.count()
+        page = query.order_by(Lead.created_at.desc(), Lead.id.desc())
 
-        # Aplicar paginação
-        leads = query.order_by(Lead.created_at.desc()).offset(offset).limit(limit).all()
+        # Linhas lidas por completo aqui, dentro do try: erro de banco vira 500,
+        # e não uma resposta 200 com JSON truncado no meio do streaming
+        if use_cursor:
+            # Keyset: busca direto a partir do cursor, sem descartar linhas
+            try:
+                cursor = (datetime.fromisoformat(after_created_at), uuid.UUID(after_id))
+            except (TypeError, ValueError):
+                return jsonify({"error": "Cursor inválido: informe after_created_at e after_id"}), 400
+
+            offset = 0
+            page = page.filter(tuple_(Lead.created_at, Lead.id) < cursor)
+
+            # Total não é recalculado nas páginas seguintes (exigiria varrer a tabela)
+            rows = [(lead, None) for lead in page.limit(limit)]
+        else:
+            if offset >= MAX_OFFSET:
+                return jsonify({
+                    "error": f"Offset máximo é {MAX_OFFSET}; use after_created_at e after_id",
+                }), 400
+
+            # Total via window function, na mesma query das linhas
+            rows = (
+                page.add_columns(func.count().over())
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
 
-        return jsonify({
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "leads": [lead.to_dict() for lead in leads],
-        }), 200
+        if rows:
+            total = rows[0][1]
+        elif use_cursor:
+            total = None
+        else:
+            # Página vazia: a window function não retorna linha
+            total = query.count() if offset else 0
+
+        next_cursor = None
+        if rows and len(rows) == limit:
+            last = rows[-1][0]
+            # datetime e UUID vão crus: o orjson formata em C
+            next_cursor = {
+                "after_created_at": last.created_at,
+                "after_id": last.id,
+            }
+
+        def generate():
+            """Serializa leads incrementalmente (só serialização, sem I/O de banco)."""
+            dumps = current_app.json.dumps
+            yield '{"total": %s, "limit": %d, "offset": %d, "leads": [' % (dumps(total), limit, offset)
+            for i, (lead, _) in enumerate(rows):
+                yield ("," if i else "") + dumps(lead.to_dict())
+            yield '], "next_cursor": %s}' % dumps(next_cursor)
+
+        return Response(stream_with_context(generate()), status=200, mimetype="application/json")
 
     except Exception as e:
         logger.error("get_leads_error", error=str(e), request_id=g.request_id)
-        return jsonify(ErrorResponse(
-            error="internal_error",
-            code=500,
-            message="Erro ao listar leads",
-            timestamp=datetime.utcnow(),
-            request_id=g.request_id,
-        ).model_dump()), 500
+        return jsonify({
+            **_ERR_LIST_LEADS,
+            "timestamp": g.now.isoformat(),
+            "request_id": g.request_id,
+        }), 500
 
 
 @admin_bp.route("/leads/<lead_id>", methods=["GET"])
@@ -181,33 +289,31 @@ def get_lead_detail(lead_id: str):
         if not db:
             return jsonify({"error": "Database not available"}), 500
 
-        lead = db.session.query(Lead).filter(Lead.id == lead_id).first()
-
-        if not lead:
+        try:
+            lead_uuid = uuid.UUID(lead_id)
+        except ValueError:
             return jsonify({"error": "Lead não encontrado"}), 404
 
-        # Conversas
-        conversations = db.session.query(Conversation).filter(
-            Conversation.lead_id == lead_id
-        ).order_by(Conversation.timestamp).all()
+        # Lead + conversas + agendamentos via eager loading (SELECT ... IN)
+        lead = db.session.query(Lead).options(
+            selectinload(Lead.conversations),
+            selectinload(Lead.schedulings),
+        ).filter(Lead.id == lead_uuid).first()
 
-        # Agendamentos
-        schedulings = db.session.query(Scheduling).filter(
-            Scheduling.lead_id == lead_id
-        ).order_by(Scheduling.data_reuniao).all()
+        if not lead:
+            return jsonify({"error": "Lead não encontrado"}), 404
 
+        # Coleções já vêm ordenadas do banco (order_by do relationship)
         return jsonify({
             "lead": lead.to_dict(),
-            "conversations": [conv.to_dict() for conv in conversations],
-            "schedulings": [sched.to_dict() for sched in schedulings],
+            "conversations": [conv.to_dict() for conv in lead.conversations],
+            "schedulings": [sched.to_dict() for sched in lead.schedulings],
         }), 200
 
     except Exception as e:
         logger.error("get_lead_detail_error", error=str(e), request_id=g.request_id)
-        return jsonify(ErrorResponse(
-            error="internal_error",
-            code=500,
-            message="Erro ao buscar detalhes do lead",
-            timestamp=datetime.utcnow(),
-            request_id=g.request_id,
-        ).model_dump()), 500
+        return jsonify({
+            **_ERR_LEAD_DETAIL,
+            "timestamp": g.now.isoformat(),
+            "request_id": g.request_id,
+        }), 500
@@ -1,29 +1,63 @@
 """
 Rotas de webhook para integração com Evolution API.
 """
-from flask import request, jsonify, g, current_app
-from datetime import datetime
+from flask import request, jsonify, g
 from pydantic import ValidationError
 import hmac
-import hashlib
 
 from src.api import webhooks_bp
 from src.config import settings
-from src.schemas.payloads import EvolutionWebhookPayload, ErrorResponse
-from src.services.lead_screening import LeadScreening
+from src.schemas.payloads import EvolutionWebhookPayload
+from src.services.message_queue import enqueue_inbound_messages
+from src.utils.idempotency import claim_message
 from src.utils.logging import get_logger, log_webhook_received
-from src.utils.security import extract_bearer_token
+from src.utils.security import extract_bearer_token, validate_webhook_signature
 
 
 logger = get_logger(__name__)
 
+# Templates de erro (timestamp e request_id são adicionados por request)
+_ERR_UNAUTHORIZED = {"error": "unauthorized", "code": 401, "message": "Token de autenticação inválido"}
+_ERR_VALIDATION = {"error": "validation_error", "code": 400, "message": "Payload inválido"}
+_ERR_PROCESSING = {"error": "processing_error", "code": 500, "message": "Erro ao processar webhook"}
+_ERR_UNEXPECTED = {"error": "unexpected_error", "code": 500, "message": "Erro inesperado ao processar webhook"}
+
+# Secret em bytes, calculado uma única vez
+_WEBHOOK_SECRET_BYTES = settings.webhook_secret.encode("utf-8")
+
+
+def _is_authenticated(raw_body: bytes) -> bool:
+    """
+    Autentica o webhook.
+
+    Verifica o header X-Signature (HMAC-SHA256 hex do body bruto). Enquanto
+    `webhook_allow_bearer_auth` estiver ligado, aceita também o Bearer token.
+
+    Args:
+        raw_body: Body da requisição em bytes
+
+    Returns:
+        True se a requisição é autêntica
+    """
+    signature = request.headers.get("X-Signature")
+    if signature:
+        return validate_webhook_signature(raw_body, signature, _WEBHOOK_SECRET_BYTES)
+
+    if not settings.webhook_allow_bearer_auth:
+        return False
+
+    # Fallback: Bearer token (comparação em tempo constante)
+    token = extract_bearer_token(request.headers.get("Authorization"))
+    return bool(token) and hmac.compare_digest(token.encode("utf-8"), _WEBHOOK_SECRET_BYTES)
+
 
 @webhooks_bp.route("/evolution", methods=["POST"])
 def evolution_webhook():
     """
     Webhook para receber mensagens da Evolution API.
 
-    Valida assinatura, processa mensagem e retorna resposta.
+    Valida assinatura HMAC (X-Signature) e payload, enfileira as mensagens para triagem em
+    background e retorna imediatamente.
 
     Returns:
         JSON response com status
@@ -32,45 +66,37 @@ def evolution_webhook():
     try:
         # ========== Validação de Segurança ==========
 
-        # Valida Bearer token
-        auth_header = request.headers.get("Authorization")
-        token = extract_bearer_token(auth_header)
+        # Body bruto lido uma única vez (assinatura + parse)
+        raw_body = request.get_data(cache=False)
 
-        if not token or token != settings.webhook_secret:
+        if not _is_authenticated(raw_body):
             logger.warning(
                 "webhook_authentication_failed",
                 request_id=g.request_id,
                 ip=request.remote_addr,
             )
-            return jsonify(ErrorResponse(
-                error="unauthorized",
-                code=401,
-                message="Token de autenticação inválido",
-                timestamp=datetime.utcnow(),
-                request_id=g.request_id,
-            ).model_dump()), 401
+            return jsonify({
+                **_ERR_UNAUTHORIZED,
+                "timestamp": g.now.isoformat(),
+                "request_id": g.request_id,
+            }), 401
 
         # ========== Validação de Payload ==========
 
         try:
-            payload_data = request.get_json()
-            if not payload_data:
-                raise ValueError("Payload vazio")
-
-            payload = EvolutionWebhookPayload(**payload_data)
+            # Parse + validação em uma única passada sobre os bytes brutos
+            payload = EvolutionWebhookPayload.model_validate_json(raw_body)
         except ValidationError as e:
             logger.error(
                 "webhook_validation_error",
                 request_id=g.request_id,
                 error=str(e),
             )
-            return jsonify(ErrorResponse(
-                error="validation_error",
-                code=400,
-                message="Payload inválido",
-                timestamp=datetime.utcnow(),
-                request_id=g.request_id,
-            ).model_dump()), 400
+            return jsonify({
+                **_ERR_VALIDATION,
+                "timestamp": g.now.isoformat(),
+                "request_id": g.request_id,
+            }), 400
 
         # ========== Processamento da Mensagem ==========
 
@@ -80,10 +106,17 @@ def evolution_webhook():
                 logger.debug(
                     "webhook_non_message_event",
                     request_id=g.request_id,
-                    event=payload.event,
+                    webhook_event=payload.event,
                 )
                 return jsonify({"status": "ok"}), 200
 
+            # Tamanho do body vem do header, sem serializar o payload
+            payload_size = request.content_length or 0
+
+            # Mensagens agrupadas por telefone (ordem de chegada preservada):
+            # uma rajada do mesmo lead vira uma única chamada à OpenAI
+            pending_by_phone = {}
+
             # Processa cada mensagem
             for message in payload.data.messages:
                 # Ignora mensagens enviadas por nós
@@ -94,25 +127,33 @@ def evolution_webhook():
                 phone = message.remoteJid
                 message_text = message.conversation or ""
 
+                # Ignora reenvios da mesma mensagem (retries da Evolution API);
+                # a chave é liberada se a triagem falhar, para o reenvio ser processado
+                message_key = message.id or f"{phone}:{message_text}"
+                if not claim_message(message_key):
+                    logger.info(
+                        "webhook_duplicate",
+                        request_id=g.request_id,
+                        message_id=message.id,
+                    )
+                    continue
+
                 # Log de webhook recebido
                 log_webhook_received(
                     phone=phone,
                     event=payload.event,
-                    payload_size=len(str(payload_data)),
+                    payload_size=payload_size,
                 )
 
-                # Processa com LeadScreening
-                db = current_app.extensions.get("sqlalchemy")
-                if db:
-                    screening = LeadScreening(db.session)
-                    result = screening.receive_lead_message(phone, message_text)
+                texts, message_keys = pending_by_phone.setdefault(phone, ([], []))
+                texts.append(message_text)
+                message_keys.append(message_key)
 
-                    logger.info(
-                        "webhook_message_processed",
-                        request_id=g.request_id,
-                        phone=phone,
-                        success=result.get("success"),
-                    )
+            # Enfileira triagem (DB + OpenAI) fora do request
+            enqueue_inbound_messages(pending_by_phone, g.request_id)
+
+            if settings.webhook_async_processing:
+                return jsonify({"status": "queued"}), 200
 
             return jsonify({"status": "ok"}), 200
 
@@ -122,13 +163,11 @@ def evolution_webhook():
                 request_id=g.request_id,
                 error=str(e),
             )
-            return jsonify(ErrorResponse(
-                error="processing_error",
-                code=500,
-                message="Erro ao processar webhook",
-                timestamp=datetime.utcnow(),
-                request_id=g.request_id,
-            ).model_dump()), 500
+            return jsonify({
+                **_ERR_PROCESSING,
+                "timestamp": g.now.isoformat(),
+                "request_id": g.request_id,
+            }), 500
 
     except Exception as e:
         logger.error(
@@ -136,13 +175,11 @@ def evolution_webhook():
             request_id=g.request_id,
             error=str(e),
         )
-        return jsonify(ErrorResponse(
-            error="unexpected_error",
-            code=500,
-            message="Erro inesperado ao processar webhook",
-            timestamp=datetime.utcnow(),
-            request_id=g.request_id,
-        ).model_dump()), 500
+        return jsonify({
+            **_ERR_UNEXPECTED,
+            "timestamp": g.now.isoformat(),
+            "request_id": g.request_id,
+        }), 500
 
 
 @webhooks_bp.route("/evolution", methods=["GET"])
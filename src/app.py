@@ -1,41 +1,59 @@
 """
 Aplicação Flask principal para automação de WhatsApp.
 """
-from flask import Flask, jsonify, request, g
-from flask_cors import CORS
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 import logging
-import uuid
+import os
+import time
 
-from src.config import settings, validate_settings
+from src.config import settings, get_settings
 from src.utils.logging import setup_logging, get_logger
-from src.models.lead import Base as LeadBase
-from src.models.conversation import Base as ConversationBase
-from src.models.scheduling import Base as SchedulingBase
-from src.schemas.payloads import HealthCheckResponse, ErrorResponse
+
+if TYPE_CHECKING:
+    from flask import Flask
 
 
 logger = get_logger(__name__)
 
+# Templates de erro (timestamp e request_id são adicionados por request);
+# mesmo formato de ErrorResponse, sem construir o model no caminho de erro
+_ERR_NOT_FOUND = {"error": "not_found", "code": 404, "message": "Endpoint não encontrado"}
+_ERR_INTERNAL = {"error": "internal_error", "code": 500, "message": "Erro interno do servidor"}
+
+# Último resultado do ping ao banco em /health (por worker)
+_HEALTH_CACHE = {"ts": float("-inf"), "database": "unknown"}
+
 
-def create_app(config=None) -> Flask:
+def create_app(config=None) -> "Flask":
     """
     Factory para criar aplicação Flask.
 
+    Flask, extensões, models e blueprints são importados aqui dentro, para
+    que `import src.app` (CLI, forks de worker) não pague esse custo.
+
     Args:
         config: Configuração customizada (opcional)
 
     Returns:
-        Instância de Flask app
+        Instância de Flask app (o SQLAlchemy fica em app.extensions["sqlalchemy"])
     """
+    from flask import Flask, jsonify, request, g
+    from flask_cors import CORS
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+    from flask_sqlalchemy import SQLAlchemy
+    from sqlalchemy import text
+    from src.utils.json_provider import ORJSONProvider
+    from src.models import Base
 
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
     # ========== Setup Inicial ==========
+    # Campos obrigatórios já validados pelo Pydantic (singleton cacheado)
     try:
-        validate_settings()
+        get_settings()
     except Exception as e:
         logger.error(f"config_validation_failed: {e}")
         raise
@@ -45,6 +63,10 @@ def create_app(config=None) -> Flask:
         log_level=settings.log_level,
         environment=settings.environment,
     )
+    logger.info("settings_validated")
+
+    # Decidido uma vez: acima de DEBUG os hooks de request não montam kwargs de log
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
 
     # Configuração da app
     app.config["SECRET_KEY"] = settings.secret_key
@@ -58,22 +80,18 @@ def create_app(config=None) -> Flask:
     )
 
     # ========== Rate Limiting ==========
+    # Fixed window: um contador por chave (O(1) por hit), expirando a cada janela
     limiter = Limiter(
         app=app,
         key_func=get_remote_address,
-        default_limits=["100 per minute"],
-        storage_uri="memory://",
+        default_limits=[f"{settings.rate_limit_global} per minute"],
+        strategy="fixed-window",
+        storage_uri=settings.rate_limit_storage_uri or settings.redis_url or "memory://",
     )
 
     # ========== Database ==========
-    from flask_sqlalchemy import SQLAlchemy
-
-    db = SQLAlchemy(app)
-
-    # Merge bases
-    for base in [LeadBase, ConversationBase, SchedulingBase]:
-        for table in base.metadata.tables.values():
-            table.to_metadata(db.metadata)
+    # Base compartilhada dos models: db.metadata é o próprio Base.metadata
+    db = SQLAlchemy(app, model_class=Base)
 
     # Cria tabelas se não existirem
     with app.app_context():
@@ -83,25 +101,34 @@ def create_app(config=None) -> Flask:
         except Exception as e:
             logger.error(f"database_initialization_failed: {e}")
 
+        # View materializada de estatísticas (Postgres, criada via migration 002)
+        if db.engine.dialect.name == "postgresql":
+            from src.services.stats_refresher import start_stats_refresher
+            start_stats_refresher(app)
+
     # ========== Request/Response Handling ==========
 
     @app.before_request
     def before_request():
         """Setup antes de cada request."""
-        g.request_id = str(uuid.uuid4())
-        g.start_time = datetime.utcnow()
-        logger.debug(
-            "request_start",
-            request_id=g.request_id,
-            method=request.method,
-            path=request.path,
-        )
+        g.request_id = os.urandom(16).hex()
+        # Timestamp único do request (logs, respostas e filtros de query)
+        g.now = datetime.now(timezone.utc)
+        # Duração medida com relógio monotônico, sem datetime/timedelta
+        g.start_ns = time.perf_counter_ns()
+        if debug_enabled:
+            logger.debug(
+                "request_start",
+                request_id=g.request_id,
+                method=request.method,
+                path=request.path,
+            )
 
     @app.after_request
     def after_request(response):
         """Cleanup após cada request."""
-        if hasattr(g, "start_time"):
-            duration_ms = int((datetime.utcnow() - g.start_time).total_seconds() * 1000)
+        if debug_enabled and hasattr(g, "start_ns"):
+            duration_ms = (time.perf_counter_ns() - g.start_ns) // 1_000_000
             logger.debug(
                 "request_end",
                 request_id=g.request_id,
@@ -113,46 +140,51 @@ def create_app(config=None) -> Flask:
     @app.errorhandler(404)
     def not_found(error):
         """Handler para 404."""
-        return jsonify(ErrorResponse(
-            error="not_found",
-            code=404,
-            message="Endpoint não encontrado",
-            timestamp=datetime.utcnow(),
-            request_id=g.request_id,
-        ).model_dump()), 404
+        return jsonify({
+            **_ERR_NOT_FOUND,
+            "timestamp": g.now.isoformat(),
+            "request_id": g.request_id,
+        }), 404
 
     @app.errorhandler(500)
     def internal_error(error):
         """Handler para 500."""
         logger.error("internal_error", error=str(error), request_id=g.request_id)
-        return jsonify(ErrorResponse(
-            error="internal_error",
-            code=500,
-            message="Erro interno do servidor",
-            timestamp=datetime.utcnow(),
-            request_id=g.request_id,
-        ).model_dump()), 500
+        return jsonify({
+            **_ERR_INTERNAL,
+            "timestamp": g.now.isoformat(),
+            "request_id": g.request_id,
+        }), 500
 
     # ========== Rotas Básicas ==========
 
     @app.route("/health", methods=["GET"])
     def health_check():
-        """Health check endpoint."""
-        try:
-            db.session.execute("SELECT 1")
-            database_status = "connected"
-        except Exception as e:
-            logger.error(f"health_check_db_error: {e}")
-            database_status = "disconnected"
-
-        response = HealthCheckResponse(
-            status="healthy" if database_status == "connected" else "degraded",
-            timestamp=datetime.utcnow(),
-            version="1.0.0",
-            database=database_status,
-        )
+        """
+        Health check endpoint.
+
+        O status do banco é cacheado por `health_cache_ttl_seconds`, para que
+        o polling do load balancer não vire um SELECT por chamada.
+        """
+        database_status = _HEALTH_CACHE["database"]
+        if time.monotonic() - _HEALTH_CACHE["ts"] >= settings.health_cache_ttl_seconds:
+            try:
+                db.session.execute(text("SELECT 1"))
+                database_status = "connected"
+            except Exception as e:
+                logger.error(f"health_check_db_error: {e}")
+                database_status = "disconnected"
+
+            _HEALTH_CACHE["database"] = database_status
+            _HEALTH_CACHE["ts"] = time.monotonic()
 
-        return jsonify(response.model_dump()), 200
+        return jsonify({
+            "status": "healthy" if database_status == "connected" else "degraded",
+            "timestamp": g.now.isoformat(),
+            "version": "1.0.0",
+            "database": database_status,
+            "message": None,
+        }), 200
 
     @app.route("/status", methods=["GET"])
     @limiter.limit("10 per minute")
@@ -161,12 +193,13 @@ def create_app(config=None) -> Flask:
         return jsonify({
             "status": "operational",
             "environment": settings.environment,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": g.now.isoformat(),
             "version": "1.0.0",
         }), 200
 
     # ========== API Routes ==========
 
+    # Blueprints importados só no registro (puxam services e OpenAI)
     from src.api import webhooks_bp, admin_bp
 
     app.register_blueprint(webhooks_bp, url_prefix="/api/webhooks")
@@ -174,10 +207,10 @@ def create_app(config=None) -> Flask:
 
     logger.info("app_initialized", environment=settings.environment)
 
-    return app, db
+    return app
 
 
 # Criar app para development/testing
 if __name__ == "__main__":
-    app, db = create_app()
+    app = create_app()
     app.run(debug=True, port=5000)
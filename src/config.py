@@ -3,10 +3,32 @@ Configuração centralizada da aplicação.
 Carrega e valida variáveis de ambiente.
 """
 import os
-from typing import List, Optional
+from typing import Any, FrozenSet, List, Optional
 from functools import lru_cache
-from pydantic_settings import BaseSettings
-from pydantic import field_validator, HttpUrl
+from pydantic.fields import FieldInfo
+from pydantic_settings import BaseSettings, DotEnvSettingsSource, EnvSettingsSource
+from pydantic import field_validator, model_validator, HttpUrl
+
+
+# Campos frozenset lidos do ambiente como CSV ("RS,SC,PR"), não como JSON
+_CSV_FIELDS = frozenset({"eligible_regions", "interest_regions"})
+
+
+class _CSVFieldsMixin:
+    """Entrega o texto cru dos campos CSV ao validador, sem o decode JSON de campos complexos."""
+
+    def prepare_field_value(self, field_name: str, field: FieldInfo, value: Any, value_is_complex: bool) -> Any:
+        if field_name in _CSV_FIELDS and isinstance(value, str):
+            return value
+        return super().prepare_field_value(field_name, field, value, value_is_complex)
+
+
+class _EnvSource(_CSVFieldsMixin, EnvSettingsSource):
+    """Variáveis de ambiente."""
+
+
+class _DotEnvSource(_CSVFieldsMixin, DotEnvSettingsSource):
+    """Arquivo .env."""
 
 
 class Settings(BaseSettings):
@@ -22,6 +44,7 @@ class Settings(BaseSettings):
     openai_temperature: float = 0.7
     openai_cost_limit_monthly: float = 20.0
     openai_timeout_seconds: int = 3
+    openai_history_max_tokens: int = 1000  # Orçamento (estimado) de tokens do histórico enviado
 
     # ========== Evolution API ==========
     evolution_api_url: str
@@ -30,6 +53,7 @@ class Settings(BaseSettings):
 
     # ========== Webhook Security ==========
     webhook_secret: str
+    webhook_allow_bearer_auth: bool = True  # Aceita Bearer token além do X-Signature (rollout)
     secret_key: str  # Para Flask sessions
 
     # ========== Prompts ==========
@@ -38,10 +62,12 @@ class Settings(BaseSettings):
     # ========== Rate Limiting ==========
     rate_limit_per_phone: int = 30  # req/min
     rate_limit_global: int = 100    # req/min
+    rate_limit_storage_uri: Optional[str] = None  # Padrão: REDIS_URL, senão memory://
 
     # ========== Regiões ==========
-    eligible_regions: str = "RS,SC,PR,SP,RJ,MG,ES,GO,MT,MS,DF"
-    interest_regions: str = "BA,PE,CE,RN,PB,AL,SE,PI,MA,AP,AM,RR,AC,TO"
+    # CSV no ambiente (ELIGIBLE_REGIONS=RS,SC,...); frozenset de UFs em maiúsculas no código
+    eligible_regions: FrozenSet[str] = frozenset("RS,SC,PR,SP,RJ,MG,ES,GO,MT,MS,DF".split(","))
+    interest_regions: FrozenSet[str] = frozenset("BA,PE,CE,RN,PB,AL,SE,PI,MA,AP,AM,RR,AC,TO".split(","))
 
     # ========== Email/Notificações ==========
     alert_email: str = "noreply@example.com"  # Default - não obrigatório
@@ -66,8 +92,18 @@ class Settings(BaseSettings):
     alert_cost_threshold_warning: float = 0.5    # 50%
     alert_cost_threshold_critical: float = 0.8   # 80%
 
+    # ========== Caching ==========
+    redis_url: Optional[str] = None    # Opcional: cache/deduplicação compartilhados entre workers
+    usage_cache_ttl_seconds: int = 60  # TTL do cache de /api/admin/usage
+    health_cache_ttl_seconds: float = 2.0  # TTL do status do banco em /health
+    webhook_dedup_ttl_seconds: int = 600  # Janela de deduplicação de mensagens do webhook
+    lead_status_counts_refresh_seconds: int = 60  # Refresh da view lead_status_counts (0 = desligado)
+    openai_response_cache_ttl_seconds: int = 3600  # Cache de respostas a mensagens iniciais curtas (0 = desligado)
+
     # ========== Timeouts ==========
     webhook_timeout_seconds: int = 5
+    webhook_async_processing: bool = True  # Triagem em background (resposta imediata)
+    webhook_workers: int = 4               # Threads para triagem em background
     lead_inactivity_hours: int = 2
 
     # ========== Feature Flags ==========
@@ -79,11 +115,42 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
 
-    @field_validator("eligible_regions", "interest_regions")
     @classmethod
-    def parse_regions(cls, v: str) -> List[str]:
-        """Converte string comma-separated em lista."""
-        return [r.strip() for r in v.split(",") if r.strip()]
+    def settings_customise_sources(
+        cls,
+        settings_cls,
+        init_settings,
+        env_settings,
+        dotenv_settings,
+        file_secret_settings,
+    ):
+        """Fontes padrão, com env/.env lendo os campos de regiões como CSV."""
+        return (
+            init_settings,
+            _EnvSource(
+                settings_cls,
+                case_sensitive=env_settings.case_sensitive,
+                env_prefix=env_settings.env_prefix,
+                env_nested_delimiter=env_settings.env_nested_delimiter,
+            ),
+            _DotEnvSource(
+                settings_cls,
+                env_file=dotenv_settings.env_file,
+                env_file_encoding=dotenv_settings.env_file_encoding,
+                case_sensitive=dotenv_settings.case_sensitive,
+                env_prefix=dotenv_settings.env_prefix,
+                env_nested_delimiter=dotenv_settings.env_nested_delimiter,
+            ),
+            file_secret_settings,
+        )
+
+    @field_validator("eligible_regions", "interest_regions", mode="before")
+    @classmethod
+    def parse_regions(cls, v: Any) -> FrozenSet[str]:
+        """Converte string comma-separated (ou coleção) em frozenset de UFs (maiúsculas)."""
+        if isinstance(v, str):
+            v = v.split(",")
+        return frozenset(r.strip().upper() for r in v if r.strip())
 
     @field_validator("cors_origins")
     @classmethod
@@ -93,17 +160,22 @@ class Settings(BaseSettings):
             return ["*"]
         return [o.strip() for o in v.split(",") if o.strip()]
 
-    def get_eligible_regions(self) -> List[str]:
-        """Retorna lista de regiões elegíveis."""
-        if isinstance(self.eligible_regions, str):
-            return [r.strip() for r in self.eligible_regions.split(",")]
-        return self.eligible_regions
-
-    def get_interest_regions(self) -> List[str]:
-        """Retorna lista de regiões de interesse."""
-        if isinstance(self.interest_regions, str):
-            return [r.strip() for r in self.interest_regions.split(",")]
-        return self.interest_regions
+    @model_validator(mode="after")
+    def check_notification_settings(self) -> "Settings":
+        """Exige SMTP_USER/SMTP_PASS/SMTP_FROM quando notificações estão ligadas."""
+        if self.feature_notifications:
+            missing = [
+                name
+                for name, value in (
+                    ("SMTP_USER", self.smtp_user),
+                    ("SMTP_PASS", self.smtp_pass),
+                    ("SMTP_FROM", self.smtp_from),
+                )
+                if not value
+            ]
+            if missing:
+                raise ValueError(f"Variáveis de ambiente obrigatórias faltando: {', '.join(missing)}")
+        return self
 
 
 @lru_cache()
@@ -115,44 +187,5 @@ def get_settings() -> Settings:
     return Settings()
 
 
-def validate_settings() -> Settings:
-    """
-    Valida todas as configurações necessárias.
-    Deve ser chamada na inicialização da app.
-    """
-    try:
-        settings = get_settings()
-
-        # Validações críticas
-        required_fields = [
-            'database_url',
-            'openai_api_key',
-            'evolution_api_url',
-            'evolution_api_key',
-            'evolution_instance_id',
-            'webhook_secret',
-            'secret_key',
-        ]
-
-        if settings.feature_notifications:
-            required_fields.extend([
-                'smtp_user',
-                'smtp_pass',
-                'smtp_from',
-            ])
-
-        for field in required_fields:
-            value = getattr(settings, field, None)
-            if not value:
-                raise ValueError(f"❌ Variável de ambiente obrigatória faltando: {field.upper()}")
-
-        print("✅ Todas as variáveis de ambiente foram validadas com sucesso!")
-        return settings
-
-    except Exception as e:
-        print(f"❌ Erro ao validar configurações: {e}")
-        raise
-
-
 # Exportar settings singleton
 settings = get_settings()
@@ -1,6 +1,58 @@
 """Models SQLAlchemy."""
+from functools import lru_cache
+from typing import Tuple
+from sqlalchemy import inspect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql.functions import FunctionElement
+
+
+@lru_cache(maxsize=None)
+def _column_keys(model: type) -> Tuple[str, ...]:
+    """Chaves das colunas mapeadas do model, na ordem de declaração."""
+    return tuple(attr.key for attr in inspect(model).column_attrs)
+
+
+class _SerializableModel:
+    """Base dos models com serialização genérica para dicionário."""
+
+    def to_dict(self) -> dict:
+        """
+        Converte model para dicionário (uma chave por coluna).
+
+        Valores saem crus (datetime, UUID, Enum): o ORJSONProvider da app
+        serializa esses tipos nativamente.
+        """
+        return {key: getattr(self, key) for key in _column_keys(type(self))}
+
+
+# Base única: todos os models no mesmo MetaData (FKs e relationships resolvem entre si)
+Base = declarative_base(cls=_SerializableModel)
+
+
+class gen_random_uuid(FunctionElement):
+    """
+    Default de UUID gerado pelo banco (server_default das primary keys).
+
+    Postgres usa `gen_random_uuid()` (nativo no 13+, pgcrypto antes);
+    no SQLite dos testes vira 16 bytes aleatórios em hex (o CHAR(32) do `Uuid`).
+    """
+    name = "gen_random_uuid"
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid)
+def _gen_random_uuid_default(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid, "sqlite")
+def _gen_random_uuid_sqlite(element, compiler, **kw):
+    return "(lower(hex(randomblob(16))))"
+
+
 from .lead import Lead
 from .conversation import Conversation
 from .scheduling import Scheduling
 
-__all__ = ["Lead", "Conversation", "Scheduling"]
+__all__ = ["Base", "Lead", "Conversation", "Scheduling"]
@@ -1,15 +1,11 @@
 """
 Model para Lead (prospect/cliente em potencial).
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-import uuid
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Enum as SQLEnum, Index
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.declarative import declarative_base
-
-
-Base = declarative_base()
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Enum as SQLEnum, Index, text, Uuid
+from sqlalchemy.orm import relationship
+from src.models import Base, gen_random_uuid
 
 
 class LeadStatus(str, Enum):
@@ -34,7 +30,7 @@ class Lead(Base):
     __tablename__ = "leads"
 
     # ===== Primary Key =====
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    id = Column(Uuid, primary_key=True, server_default=gen_random_uuid(), nullable=False)
 
     # ===== Contato =====
     phone = Column(String(20), unique=True, nullable=False, index=True)  # Ex: 5511999999999
@@ -51,7 +47,19 @@ class Lead(Base):
 
 
     # ===== Status =====
-    status = Column(SQLEnum(LeadStatus), default=LeadStatus.NOVO, nullable=False, index=True)
+    # VARCHAR + CHECK no banco; o Enum Python só valida/converte
+    status = Column(
+        SQLEnum(
+            LeadStatus,
+            name="ck_lead_status",
+            native_enum=False,
+            create_constraint=True,
+            length=32,
+            values_callable=lambda e: [m.value for m in e],
+        ),
+        default=LeadStatus.NOVO,
+        nullable=False,
+    )
     elegivel = Column(Boolean, nullable=True)  # True/False/None (ainda não validado)
 
     # ===== Follow-up =====
@@ -64,19 +72,28 @@ class Lead(Base):
     horario_preferencial = Column(String(5), nullable=True)  # Ex: 14:30
 
     # ===== Contato Inicial =====
-    data_contato = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    data_contato = Column(DateTime, default=datetime.utcnow, nullable=False)
     data_ultima_interacao = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # ===== Auditoria =====
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # ===== Relacionamentos =====
+    # Ordenação segue os índices compostos (lead_id, timestamp/data_reuniao)
+    conversations = relationship("Conversation", viewonly=True, order_by="Conversation.timestamp")
+    schedulings = relationship("Scheduling", viewonly=True, order_by="Scheduling.data_reuniao")
+
     # ===== Índices =====
     __table_args__ = (
         Index("idx_leads_status", "status"),
         Index("idx_leads_regiao", "regiao"),
         Index("idx_leads_elegivel", "elegivel"),
-        Index("idx_leads_data_proximo_followup", "data_proximo_follow_up"),
+        Index(
+            "idx_leads_data_proximo_followup",
+            "data_proximo_follow_up",
+            postgresql_where=text("data_proximo_follow_up IS NOT NULL"),
+        ),
         Index("idx_leads_data_contato", "data_contato"),
     )
 
@@ -91,34 +108,9 @@ class Lead(Base):
 
     def mark_for_followup(self, hours_from_now: int = 2) -> None:
         """Marca lead para follow-up em N horas."""
-        from datetime import timedelta
         self.data_proximo_follow_up = datetime.utcnow() + timedelta(hours=hours_from_now)
 
     def increment_followup_attempts(self) -> None:
         """Incrementa contador de tentativas de follow-up."""
         self.tentativas_follow_up += 1
         self.data_ultimo_follow_up = datetime.utcnow()
-
-    def to_dict(self) -> dict:
-        """Converte lead para dicionário."""
-        return {
-            "id": str(self.id),
-            "phone": self.phone,
-            "nome": self.nome,
-            "email": self.email,
-            "regiao": self.regiao,
-            "cidade": self.cidade,
-            "interesse": self.interesse,
-            "disponibilidade": self.disponibilidade,
-            "status": self.status.value if self.status else None,
-            "elegivel": self.elegivel,
-            "tentativas_follow_up": self.tentativas_follow_up,
-            "data_ultimo_follow_up": self.data_ultimo_follow_up.isoformat() if self.data_ultimo_follow_up else None,
-            "data_proximo_follow_up": self.data_proximo_follow_up.isoformat() if self.data_proximo_follow_up else None,
-            "data_reuniao_preferencial": self.data_reuniao_preferencial.isoformat() if self.data_reuniao_preferencial else None,
-            "horario_preferencial": self.horario_preferencial,
-            "data_contato": self.data_contato.isoformat() if self.data_contato else None,
-            "data_ultima_interacao": self.data_ultima_interacao.isoformat() if self.data_ultima_interacao else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
@@ -3,13 +3,8 @@ Model para Scheduling (agendamentos de reuniões).
 """
 from datetime import datetime
 from enum import Enum
-import uuid
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.declarative import declarative_base
-
-
-Base = declarative_base()
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Index, text, Uuid
+from src.models import Base, gen_random_uuid
 
 
 class SchedulingStatus(str, Enum):
@@ -29,18 +24,25 @@ class Scheduling(Base):
     __tablename__ = "schedulings"
 
     # ===== Primary Key =====
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    id = Column(Uuid, primary_key=True, server_default=gen_random_uuid(), nullable=False)
 
     # ===== Foreign Key =====
-    lead_id = Column(UUID(as_uuid=True), ForeignKey("leads.id"), nullable=False, index=True)
+    lead_id = Column(Uuid, ForeignKey("leads.id"), nullable=False)
 
     # ===== Reunião =====
-    data_reuniao = Column(DateTime, nullable=False, index=True)  # Data/hora da reunião
+    data_reuniao = Column(DateTime, nullable=False)  # Data/hora da reunião
+    # VARCHAR + CHECK no banco; o Enum Python só valida/converte
     status = Column(
-        SQLEnum(SchedulingStatus),
+        SQLEnum(
+            SchedulingStatus,
+            name="ck_scheduling_status",
+            native_enum=False,
+            create_constraint=True,
+            length=32,
+            values_callable=lambda e: [m.value for m in e],
+        ),
         default=SchedulingStatus.AGENDADO,
         nullable=False,
-        index=True
     )
 
     # ===== Vendedor =====
@@ -56,8 +58,12 @@ class Scheduling(Base):
 
     # ===== Índices =====
     __table_args__ = (
-        Index("idx_schedulings_lead_id", "lead_id"),
-        Index("idx_schedulings_data_reuniao", "data_reuniao"),
+        Index("idx_schedulings_lead_data_reuniao", "lead_id", "data_reuniao"),
+        Index(
+            "idx_schedulings_data_reuniao",
+            "data_reuniao",
+            postgresql_where=text("status IN ('agendado', 'confirmado')"),
+        ),
         Index("idx_schedulings_status", "status"),
     )
 
@@ -75,17 +81,8 @@ class Scheduling(Base):
         return self.data_reuniao < datetime.utcnow()
 
     def to_dict(self) -> dict:
-        """Converte agendamento para dicionário."""
-        return {
-            "id": str(self.id),
-            "lead_id": str(self.lead_id),
-            "data_reuniao": self.data_reuniao.isoformat() if self.data_reuniao else None,
-            "status": self.status.value if self.status else None,
-            "vendedor_atribuido": self.vendedor_atribuido,
-            "vendedor_email": self.vendedor_email,
-            "notas": self.notas,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "is_upcoming": self.is_upcoming,
-            "is_past": self.is_past,
-        }
+        """Converte agendamento para dicionário (colunas + flags de data)."""
+        data = super().to_dict()
+        data["is_upcoming"] = self.is_upcoming
+        data["is_past"] = self.is_past
+        return data
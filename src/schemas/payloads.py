@@ -3,7 +3,12 @@ Schemas Pydantic para validação de payloads.
 """
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from src.utils.validators import CONTROL_CHARS_TABLE, digits_only
+
+
+# Validação estrutural de email (sem email-validator/DNS no caminho do webhook)
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
 
 
 # ============================================================================
@@ -36,33 +41,34 @@ class EvolutionWebhookPayload(BaseModel):
 
 class LeadSchema(BaseModel):
     """Schema para validação de dados de lead."""
+    model_config = ConfigDict(from_attributes=True, str_strip_whitespace=True)
+
     phone: str = Field(..., min_length=10, max_length=20, description="Telefone com código país")
     nome: Optional[str] = Field(None, max_length=255)
-    email: Optional[EmailStr] = None
+    email: Optional[str] = Field(None, max_length=255, pattern=EMAIL_PATTERN)
     regiao: Optional[str] = Field(None, max_length=2, description="Código do estado (ex: RS, SP)")
     cidade: Optional[str] = Field(None, max_length=100)
     interesse: Optional[str] = Field(None, max_length=500)
     disponibilidade: Optional[str] = Field(None, max_length=500)
 
-    @validator("phone")
+    @field_validator("phone")
+    @classmethod
     def validate_phone(cls, v):
         """Valida formato do telefone."""
         # Remove caracteres especiais
-        clean = "".join(c for c in v if c.isdigit())
+        clean = digits_only(v)
         if len(clean) < 10 or len(clean) > 15:
             raise ValueError("Telefone deve ter entre 10 e 15 dígitos")
         return clean
 
-    @validator("regiao")
+    @field_validator("regiao")
+    @classmethod
     def validate_regiao(cls, v):
         """Valida código de estado."""
         if v and len(v) != 2:
             raise ValueError("Região deve ter 2 caracteres (ex: RS, SP)")
         return v.upper() if v else v
 
-    class Config:
-        from_attributes = True
-
 
 # ============================================================================
 # CONVERSATION SCHEMA
@@ -70,23 +76,23 @@ class LeadSchema(BaseModel):
 
 class ConversationSchema(BaseModel):
     """Schema para validação de conversa."""
+    model_config = ConfigDict(from_attributes=True, str_strip_whitespace=True)
+
     lead_id: str
     mensagem_entrada: str = Field(..., min_length=1, max_length=5000)
     mensagem_saida: str = Field(..., min_length=1, max_length=5000)
     tokens_input: Optional[int] = None
     tokens_output: Optional[int] = None
     tokens_total: Optional[int] = None
-    custo_estimado: Optional[int] = None  # em centavos
+    custo_estimado: Optional[int] = None  # em micro-centavos (10^-8 USD)
     tempo_resposta_ms: Optional[int] = None
 
-    @validator("mensagem_entrada", "mensagem_saida")
+    @field_validator("mensagem_entrada", "mensagem_saida")
+    @classmethod
     def sanitize_messages(cls, v):
         """Sanitiza mensagens (remove caracteres perigosos)."""
         # Remove caracteres de controle
-        return "".join(c for c in v if ord(c) >= 32 or c in "\n\t")
-
-    class Config:
-        from_attributes = True
+        return v.translate(CONTROL_CHARS_TABLE)
 
 
 # ============================================================================
@@ -95,21 +101,25 @@ class ConversationSchema(BaseModel):
 
 class SchedulingSchema(BaseModel):
     """Schema para validação de agendamento."""
+    model_config = ConfigDict(from_attributes=True, str_strip_whitespace=True)
+
     lead_id: str
     data_reuniao: datetime = Field(..., description="Data e hora da reunião")
     horario_preferencial: Optional[str] = Field(None, pattern=r"^\d{2}:\d{2}$", description="Formato HH:MM")
     vendedor_atribuido: Optional[str] = Field(None, max_length=255)
-    vendedor_email: Optional[EmailStr] = None
+    vendedor_email: Optional[str] = Field(None, max_length=255, pattern=EMAIL_PATTERN)
     notas: Optional[str] = Field(None, max_length=500)
 
-    @validator("data_reuniao")
+    @field_validator("data_reuniao")
+    @classmethod
     def validate_data_reuniao(cls, v):
         """Valida que data é futura."""
         if v <= datetime.utcnow():
             raise ValueError("Data da reunião deve ser no futuro")
         return v
 
-    @validator("horario_preferencial")
+    @field_validator("horario_preferencial")
+    @classmethod
     def validate_horario(cls, v):
         """Valida se horário é comercial (9h-18h)."""
         if v:
@@ -118,9 +128,6 @@ class SchedulingSchema(BaseModel):
                 raise ValueError("Horário deve ser entre 09:00 e 18:00 (horário comercial)")
         return v
 
-    class Config:
-        from_attributes = True
-
 
 # ============================================================================
 # HEALTH CHECK
@@ -141,11 +148,10 @@ class HealthCheckResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Resposta de erro padrão."""
+    model_config = ConfigDict(from_attributes=True)
+
     error: str
     code: int
     message: str
     timestamp: datetime
     request_id: Optional[str] = None
-
-    class Config:
-        from_attributes = True
@@ -2,13 +2,16 @@
 Serviço de triagem e qualificação de leads.
 Gerencia o fluxo de triagem, coleta de dados e agendamento.
 """
+import uuid
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.models.lead import Lead, LeadStatus
+from src.config import settings
 from src.models.conversation import Conversation
-from src.services.openai_agent import OpenAIAgent
-from src.services.regional_validation import RegionalValidator
+from src.services.openai_agent import OpenAIAgent, eligibility_explanation, get_openai_agent
+from src.services.regional_validation import RegionalValidator, get_regional_validator
 from src.utils.logging import get_logger, log_lead_status_change
 from src.utils.validators import sanitize_text, extrair_telefone_whatsapp
 
@@ -19,16 +22,26 @@ logger = get_logger(__name__)
 class LeadScreening:
     """Serviço de triagem inteligente de leads."""
 
-    def __init__(self, db: Session):
+    # Instanciado por mensagem recebida: sem __dict__ por instância
+    __slots__ = ("db", "agent", "validator")
+
+    def __init__(
+        self,
+        db: Session,
+        agent: Optional[OpenAIAgent] = None,
+        validator: Optional[RegionalValidator] = None,
+    ):
         """
         Inicializa serviço de triagem.
 
         Args:
             db: Sessão SQLAlchemy
+            agent: Agente OpenAI (padrão: singleton compartilhado)
+            validator: Validador regional (padrão: singleton compartilhado)
         """
         self.db = db
-        self.agent = OpenAIAgent()
-        self.validator = RegionalValidator()
+        self.agent = agent or get_openai_agent()
+        self.validator = validator or get_regional_validator()
 
     def receive_lead_message(
         self,
@@ -60,37 +73,46 @@ class LeadScreening:
             clean_message = sanitize_text(message_text)
 
             # Encontra ou cria lead
-            lead = self.db.query(Lead).filter(Lead.phone == phone).first()
+            # Busca pelo índice único de phone (statement compilado fica no cache do engine)
+            lead = self.db.scalars(select(Lead).where(Lead.phone == phone)).first()
 
-            if not lead:
-                # Lead novo
+            is_new_lead = lead is None
+            if is_new_lead:
+                # Lead novo (flush gera o id no banco, sem commit intermediário)
                 lead = Lead(
                     phone=phone,
                     status=LeadStatus.NOVO,
                     data_contato=datetime.utcnow(),
                 )
                 self.db.add(lead)
-                self.db.commit()
-                logger.info("new_lead_created", phone=phone, lead_id=str(lead.id))
+                self.db.flush()
 
             # Muda para em_triagem se estava novo
-            if lead.status == LeadStatus.NOVO:
-                old_status = lead.status
+            old_status = lead.status
+            if old_status == LeadStatus.NOVO:
                 lead.status = LeadStatus.EM_TRIAGEM
-                self.db.commit()
-                log_lead_status_change(str(lead.id), old_status.value, LeadStatus.EM_TRIAGEM.value)
 
             # Atualiza data de última interação
             lead.data_ultima_interacao = datetime.utcnow()
 
-            # Constrói histórico de conversa
-            conversation_history = self._build_conversation_history(lead.id)
+            # Constrói histórico de conversa (lead novo não tem histórico)
+            conversation_history = [] if is_new_lead else self._build_conversation_history(lead.id)
+
+            # Commit antes da OpenAI: o lead fica registrado mesmo se a chamada
+            # falhar, e nenhuma transação fica aberta durante a latência da API
+            self.db.commit()
+
+            if is_new_lead:
+                logger.info("new_lead_created", phone=phone, lead_id=str(lead.id))
+            if old_status == LeadStatus.NOVO:
+                log_lead_status_change(str(lead.id), old_status.value, LeadStatus.EM_TRIAGEM.value)
 
             # Gera resposta do agente
             response_text, metadata = self.agent.generate_response(
                 user_message=clean_message,
                 conversation_history=conversation_history,
                 lead_id=str(lead.id),
+                is_first_contact=is_new_lead,
             )
 
             # Salva conversa no banco
@@ -101,17 +123,18 @@ class LeadScreening:
                 tokens_input=metadata.get("tokens_input"),
                 tokens_output=metadata.get("tokens_output"),
                 tokens_total=metadata.get("tokens_total"),
-                custo_estimado=metadata.get("cost_cents"),
+                custo_estimado=metadata.get("cost_microcents"),
                 tempo_resposta_ms=metadata.get("latency_ms"),
             )
             self.db.add(conversation)
-            self.db.commit()
 
             # Marca lead para follow-up se não elegível e sem resposta clara
             if lead.status == LeadStatus.AGUARDANDO_RESPOSTA:
                 # Se ainda aguardando resposta, marca para follow-up
                 lead.mark_for_followup(hours_from_now=2)
-                self.db.commit()
+
+            # Conversa + follow-up na mesma transação
+            self.db.commit()
 
             return {
                 "success": True,
@@ -124,6 +147,7 @@ class LeadScreening:
             }
 
         except Exception as e:
+            self.db.rollback()
             logger.error("lead_screening_error", error=str(e), remote_jid=remote_jid)
             return {
                 "success": False,
@@ -142,7 +166,7 @@ class LeadScreening:
         """
 
         try:
-            lead = self.db.query(Lead).filter(Lead.id == lead_id).first()
+            lead = self.db.scalars(select(Lead).where(Lead.id == uuid.UUID(str(lead_id)))).first()
             if not lead:
                 return {"success": False, "error": "Lead não encontrado"}
 
@@ -152,11 +176,16 @@ class LeadScreening:
                     "error": "Região não informada",
                 }
 
-            # Valida região
-            is_eligible, description = self.agent.check_eligibility(
-                lead.regiao,
-                self.validator.eligible_regions,
-            )
+            # UF conhecida: decisão determinística pelo validador regional;
+            # o agente fica só para valores que não são UF
+            if lead.regiao.upper() in self.validator.REGIOES_BRASIL:
+                is_eligible = self.validator.is_eligible(lead.regiao)
+                description = eligibility_explanation(lead.regiao, is_eligible)
+            else:
+                is_eligible, description = self.agent.check_eligibility(
+                    lead.regiao,
+                    self.validator.eligible_regions,
+                )
 
             # Atualiza lead
             lead.elegivel = is_eligible
@@ -205,7 +234,7 @@ class LeadScreening:
             True se sucesso
         """
         try:
-            lead = self.db.query(Lead).filter(Lead.id == lead_id).first()
+            lead = self.db.scalars(select(Lead).where(Lead.id == uuid.UUID(str(lead_id)))).first()
             if not lead:
                 return False
 
@@ -225,30 +254,43 @@ class LeadScreening:
         """
         Constrói histórico de conversa para contexto do agente.
 
+        Lê só as 10 trocas mais recentes (ORDER BY timestamp DESC LIMIT 10 sobre
+        idx_conversations_lead_timestamp), independente do tamanho do histórico
+        do lead, e para quando o orçamento `openai_history_max_tokens` se esgota.
+
         Args:
             lead_id: ID do lead
 
         Returns:
-            Lista de dicts com role e content para API OpenAI
+            Lista de dicts com role e content para API OpenAI (ordem cronológica)
         """
         try:
-            conversations = self.db.query(Conversation).filter(
-                Conversation.lead_id == lead_id
-            ).order_by(Conversation.timestamp).limit(10).all()
-
-            history = []
-            for conv in conversations:
-                history.append({
-                    "role": "user",
-                    "content": conv.mensagem_entrada,
-                })
-                history.append({
-                    "role": "assistant",
-                    "content": conv.mensagem_saida,
-                })
-
-            return history
-
+            conversations = self.db.scalars(
+                select(Conversation)
+                .where(Conversation.lead_id == lead_id)
+                .order_by(Conversation.timestamp.desc())
+                .limit(10)
+            ).all()
         except Exception as e:
-            logger.error("build_history_error", lead_id=lead_id, error=str(e))
+            logger.error("build_history_error", lead_id=str(lead_id), error=str(e))
             return []
+
+        budget = settings.openai_history_max_tokens
+        history = []
+        for conv in conversations:
+            # Estimativa barata: ~4 caracteres por token
+            cost = (len(conv.mensagem_entrada) + len(conv.mensagem_saida)) // 4 + 1
+            if cost > budget:
+                break
+            budget -= cost
+            history.append({
+                "role": "assistant",
+                "content": conv.mensagem_saida,
+            })
+            history.append({
+                "role": "user",
+                "content": conv.mensagem_entrada,
+            })
+
+        history.reverse()
+        return history
@@ -0,0 +1,163 @@
+"""
+Processamento assíncrono de mensagens recebidas via webhook.
+Executa a triagem (DB + OpenAI) fora do ciclo do request HTTP.
+"""
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from flask import Flask, current_app
+from src.config import settings
+from src.services.lead_screening import LeadScreening
+from src.utils.idempotency import release_message
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def _release_messages(message_keys: Sequence[str]) -> None:
+    """Libera as chaves de deduplicação para que o reenvio seja triado."""
+    for message_key in message_keys:
+        release_message(message_key)
+
+
+def _screen_message(
+    db,
+    phone: str,
+    message_text: str,
+    request_id: str,
+    message_keys: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """Executa a triagem de uma mensagem com a sessão informada."""
+    screening = LeadScreening(db.session)
+    try:
+        result = screening.receive_lead_message(phone, message_text)
+    except Exception:
+        _release_messages(message_keys)
+        raise
+
+    logger.info(
+        "webhook_message_processed",
+        request_id=request_id,
+        phone=phone,
+        success=result.get("success"),
+    )
+
+    if not result.get("success"):
+        _release_messages(message_keys)
+
+    return result
+
+
+def process_inbound_message(
+    app: Flask,
+    phone: str,
+    message_text: str,
+    request_id: str,
+    message_keys: Sequence[str] = (),
+) -> Optional[Dict[str, Any]]:
+    """
+    Processa mensagem em background, com app context e sessão próprios.
+
+    Args:
+        app: Instância Flask (o worker não herda o contexto do request)
+        phone: JID do WhatsApp
+        message_text: Texto da mensagem
+        request_id: ID do request que originou a mensagem
+        message_keys: Chaves de deduplicação, liberadas se a triagem falhar
+
+    Returns:
+        Dict com resultado do processamento ou None se DB indisponível
+    """
+    with app.app_context():
+        db = app.extensions.get("sqlalchemy")
+        if not db:
+            logger.error("background_db_unavailable", request_id=request_id)
+            _release_messages(message_keys)
+            return None
+
+        try:
+            return _screen_message(db, phone, message_text, request_id, message_keys)
+        except Exception as e:
+            logger.error(
+                "background_processing_error",
+                request_id=request_id,
+                phone=phone,
+                error=str(e),
+            )
+            return None
+        finally:
+            db.session.remove()
+
+
+# Singleton executor
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Retorna executor singleton para processamento de mensagens."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.webhook_workers,
+            thread_name_prefix="webhook",
+        )
+    return _executor
+
+
+def enqueue_inbound_message(
+    phone: str,
+    message_text: str,
+    request_id: str,
+    message_keys: Sequence[str] = (),
+) -> Optional[Future]:
+    """
+    Enfileira mensagem para triagem.
+
+    Com `webhook_async_processing` desligado, processa inline no request atual.
+
+    Args:
+        phone: JID do WhatsApp
+        message_text: Texto da mensagem
+        request_id: ID do request
+        message_keys: Chaves de deduplicação (claim_message), liberadas se a triagem falhar
+
+    Returns:
+        Future da tarefa, ou None se processado de forma síncrona
+    """
+    if not settings.webhook_async_processing:
+        db = current_app.extensions.get("sqlalchemy")
+        if db:
+            _screen_message(db, phone, message_text, request_id, message_keys)
+        else:
+            _release_messages(message_keys)
+        return None
+
+    app = current_app._get_current_object()
+    return get_executor().submit(
+        process_inbound_message, app, phone, message_text, request_id, message_keys
+    )
+
+
+def enqueue_inbound_messages(
+    pending_by_phone: Dict[str, Tuple[List[str], List[str]]],
+    request_id: str,
+) -> None:
+    """
+    Enfileira as mensagens de um webhook, uma triagem por telefone.
+
+    Se uma triagem (modo síncrono) ou o submit ao executor falhar, as chaves de
+    deduplicação ainda não entregues são liberadas antes de propagar o erro:
+    o reenvio da Evolution API é processado em vez de descartado como duplicado.
+
+    Args:
+        pending_by_phone: JID -> (textos, chaves de deduplicação), em ordem de chegada
+        request_id: ID do request
+    """
+    pending = list(pending_by_phone.values())
+    for i, (phone, (texts, message_keys)) in enumerate(pending_by_phone.items()):
+        try:
+            enqueue_inbound_message(phone, "\n".join(texts), request_id, message_keys)
+        except Exception:
+            for _, keys in pending[i:]:
+                _release_messages(keys)
+            raise
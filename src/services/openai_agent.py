@@ -3,16 +3,49 @@ Serviço de integração com OpenAI.
 Gerencia chamadas ao GPT-4o-mini para triagem de leads.
 """
 import time
-from typing import Optional, Tuple
-from datetime import datetime
-from openai import OpenAI, APIError, Timeout
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+from openai import OpenAI, APIError, APITimeoutError
 from src.config import settings
+from src.services.response_cache import (
+    get_cached_response,
+    is_cacheable,
+    response_cache_key,
+    set_cached_response,
+)
 from src.utils.logging import get_logger
+from src.utils.pricing import MICROCENTS_PER_USD, PRICE_MICROCENTS_PER_TOKEN
 
 
 logger = get_logger(__name__)
 
 
+def eligibility_explanation(lead_region: str, is_eligible: bool) -> str:
+    """
+    Texto de elegibilidade mostrado ao lead (mesmo texto em qualquer caminho de decisão).
+
+    Args:
+        lead_region: Região do lead (ex: "BA")
+        is_eligible: Resultado da verificação
+
+    Returns:
+        Explicação em português
+    """
+    if is_eligible:
+        return f"Ótimo! A região {lead_region} é elegível para franquias."
+    return (
+        f"A região {lead_region} ainda não está aberta para implantações, "
+        f"mas vamos registrar seu interesse para futuras expansões."
+    )
+
+
+@lru_cache(maxsize=8)
+def _read_prompt(version: str) -> str:
+    """Lê `prompts/{version}/system.txt` uma única vez por versão."""
+    with open(f"prompts/{version}/system.txt", "r", encoding="utf-8") as f:
+        return f.read()
+
+
 class OpenAIAgent:
     """Agente inteligente usando OpenAI GPT-4o-mini."""
 
@@ -37,9 +70,7 @@ class OpenAIAgent:
         version = prompt_version or settings.prompt_version
 
         try:
-            prompt_path = f"prompts/{version}/system.txt"
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return _read_prompt(version)
         except FileNotFoundError:
             logger.error(f"prompt_file_not_found", version=version)
             # Fallback para prompt padrão
@@ -51,6 +82,7 @@ class OpenAIAgent:
         conversation_history: Optional[list] = None,
         lead_id: Optional[str] = None,
         prompt_version: Optional[str] = None,
+        is_first_contact: bool = False,
     ) -> Tuple[str, dict]:
         """
         Gera resposta do agente para mensagem do lead.
@@ -60,6 +92,7 @@ class OpenAIAgent:
             conversation_history: Histórico de conversa (lista de dicts com 'role' e 'content')
             lead_id: ID do lead (para logging)
             prompt_version: Versão do prompt a usar
+            is_first_contact: Primeira mensagem de um lead novo (única cacheável)
 
         Returns:
             Tuple (resposta, metadata)
@@ -68,6 +101,31 @@ class OpenAIAgent:
         """
 
         try:
+            # Mensagem inicial curta: tenta o cache antes da OpenAI
+            cache_key = None
+            if is_cacheable(user_message, is_first_contact):
+                cache_key = response_cache_key(
+                    prompt_version or settings.prompt_version,
+                    self.model,
+                    user_message,
+                )
+                cached = get_cached_response(cache_key)
+                if cached is not None:
+                    assistant_message, original_metadata = cached
+                    logger.info("openai_cache_hit", lead_id=lead_id or "unknown")
+                    # Sem tokens nem custo: nenhuma chamada foi feita
+                    return assistant_message, {
+                        "tokens_input": 0,
+                        "tokens_output": 0,
+                        "tokens_total": 0,
+                        "cost_usd": 0.0,
+                        "cost_microcents": 0,
+                        "latency_ms": 0,
+                        "model": original_metadata.get("model", self.model),
+                        "cached": True,
+                    }
+                logger.debug("openai_cache_miss", lead_id=lead_id or "unknown")
+
             # Carrega system prompt
             system_prompt = self._load_system_prompt(prompt_version)
 
@@ -106,10 +164,13 @@ class OpenAIAgent:
             tokens_output = response.usage.completion_tokens
             tokens_total = response.usage.total_tokens
 
-            # Calcula custo estimado (em centavos de USD)
-            # GPT-4o-mini: $0.00015 por 1K input, $0.0006 por 1K output
-            cost_usd = (tokens_input / 1000 * 0.00015) + (tokens_output / 1000 * 0.0006)
-            cost_cents = int(cost_usd * 100)
+            # Calcula custo estimado em micro-centavos (aritmética inteira, sem
+            # perder chamadas abaixo de 1 centavo); USD só para log/resposta
+            price_in, price_out = PRICE_MICROCENTS_PER_TOKEN.get(
+                self.model, PRICE_MICROCENTS_PER_TOKEN["gpt-4o-mini"]
+            )
+            cost_microcents = tokens_input * price_in + tokens_output * price_out
+            cost_usd = cost_microcents / MICROCENTS_PER_USD
 
             # Metadata da resposta
             metadata = {
@@ -117,7 +178,7 @@ class OpenAIAgent:
                 "tokens_output": tokens_output,
                 "tokens_total": tokens_total,
                 "cost_usd": cost_usd,
-                "cost_cents": cost_cents,
+                "cost_microcents": cost_microcents,
                 "latency_ms": latency_ms,
                 "model": self.model,
             }
@@ -129,12 +190,14 @@ class OpenAIAgent:
                 tokens_total=tokens_total,
                 latency_ms=latency_ms,
                 cost_usd=f"{cost_usd:.6f}",
-                timestamp=datetime.utcnow().isoformat(),
             )
 
+            if cache_key is not None:
+                set_cached_response(cache_key, assistant_message, metadata)
+
             return assistant_message, metadata
 
-        except Timeout:
+        except APITimeoutError:
             logger.error(
                 "openai_timeout",
                 lead_id=lead_id or "unknown",
@@ -161,29 +224,33 @@ class OpenAIAgent:
     def check_eligibility(
         self,
         lead_region: str,
-        eligible_regions: list,
+        eligible_regions: FrozenSet[str],
     ) -> Tuple[bool, str]:
         """
         Verifica elegibilidade regional usando agente.
 
         Args:
             lead_region: Região do lead (ex: "BA")
-            eligible_regions: Lista de regiões elegíveis
+            eligible_regions: Regiões elegíveis, já em maiúsculas (ex: settings.eligible_regions)
 
         Returns:
             Tuple (is_eligible, explanation)
         """
         region_upper = lead_region.upper() if lead_region else None
 
-        # Verifica se está em regiões elegíveis
-        is_eligible = region_upper in [r.upper() for r in eligible_regions]
+        # Verifica se está em regiões elegíveis (lookup O(1) no frozenset)
+        is_eligible = region_upper in eligible_regions
+
+        return is_eligible, eligibility_explanation(lead_region, is_eligible)
+
+
+# Singleton instance (cliente HTTP e pool de conexões reaproveitados entre mensagens)
+_agent = None
 
-        if is_eligible:
-            explanation = f"Ótimo! A região {lead_region} é elegível para franquias."
-        else:
-            explanation = (
-                f"A região {lead_region} ainda não está aberta para implantações, "
-                f"mas vamos registrar seu interesse para futuras expansões."
-            )
 
-        return is_eligible, explanation
+def get_openai_agent() -> OpenAIAgent:
+    """Retorna instância singleton do agente OpenAI."""
+    global _agent
+    if _agent is None:
+        _agent = OpenAIAgent()
+    return _agent
@@ -2,7 +2,8 @@
 Serviço de validação regional.
 Define regiões elegíveis e de interesse.
 """
-from typing import Tuple, List
+from types import MappingProxyType
+from typing import Optional, Tuple, List
 from src.config import settings
 from src.utils.logging import get_logger
 
@@ -13,8 +14,10 @@ logger = get_logger(__name__)
 class RegionalValidator:
     """Validador regional para elegibilidade de franquias."""
 
-    # Mapeamento de estados brasileiros para regiões
-    REGIOES_BRASIL = {
+    __slots__ = ("eligible_regions", "interest_regions")
+
+    # Mapeamento de estados brasileiros para regiões (somente leitura)
+    REGIOES_BRASIL = MappingProxyType({
         # Sul
         "RS": "sul",
         "SC": "sul",
@@ -45,12 +48,13 @@ class RegionalValidator:
         "RR": "norte",
         "AC": "norte",
         "TO": "norte",
-    }
+    })
 
     def __init__(self):
         """Inicializa validador com regiões do settings."""
-        self.eligible_regions = settings.get_eligible_regions()
-        self.interest_regions = settings.get_interest_regions()
+        # frozensets já normalizados (maiúsculas) pelo Settings
+        self.eligible_regions = settings.eligible_regions
+        self.interest_regions = settings.interest_regions
 
     def is_eligible(self, region_code: str) -> bool:
         """
@@ -65,8 +69,7 @@ class RegionalValidator:
         if not region_code:
             return False
 
-        region_upper = region_code.upper()
-        return region_upper in [r.upper() for r in self.eligible_regions]
+        return region_code.upper() in self.eligible_regions
 
     def is_interest_region(self, region_code: str) -> bool:
         """
@@ -81,8 +84,32 @@ class RegionalValidator:
         if not region_code:
             return False
 
-        region_upper = region_code.upper()
-        return region_upper in [r.upper() for r in self.interest_regions]
+        return region_code.upper() in self.interest_regions
+
+    def classify(self, region_code: str) -> Tuple[str, Optional[str]]:
+        """
+        Classifica a região em uma única passada (um upper, um probe por set/dict).
+
+        Args:
+            region_code: Código da região
+
+        Returns:
+            Tuple (status, regiao)
+            - status: "eligible", "interest", "unknown"
+            - regiao: Nome da região do Brasil (ex: "sul") ou None
+        """
+        if not region_code:
+            return "unknown", None
+
+        uf = region_code.upper()
+        if uf in self.eligible_regions:
+            status = "eligible"
+        elif uf in self.interest_regions:
+            status = "interest"
+        else:
+            status = "unknown"
+
+        return status, self.REGIOES_BRASIL.get(uf)
 
     def get_region_status(self, region_code: str) -> Tuple[str, str]:
         """
@@ -99,18 +126,17 @@ class RegionalValidator:
         if not region_code:
             return "unknown", "Região não informada"
 
-        region_upper = region_code.upper()
+        status, regiao = self.classify(region_code)
+        regiao_nome = (regiao or "desconhecida").title()
 
-        if self.is_eligible(region_code):
-            regiao_nome = self.REGIOES_BRASIL.get(region_upper, "desconhecida")
-            return "eligible", f"Elegível - Região {regiao_nome.title()}"
+        if status == "eligible":
+            return "eligible", f"Elegível - Região {regiao_nome}"
 
-        elif self.is_interest_region(region_code):
-            regiao_nome = self.REGIOES_BRASIL.get(region_upper, "desconhecida")
-            return "interest", f"Região em avaliação - {regiao_nome.title()}"
+        elif status == "interest":
+            return "interest", f"Região em avaliação - {regiao_nome}"
 
         else:
-            return "unknown", f"Região {region_upper} desconhecida"
+            return "unknown", f"Região {region_code.upper()} desconhecida"
 
     def get_eligible_regions_list(self) -> List[dict]:
         """
@@ -120,10 +146,10 @@ class RegionalValidator:
             Lista de dicts com código e nome da região
         """
         eligible = []
-        for code in self.eligible_regions:
-            nome = self.REGIOES_BRASIL.get(code.upper(), code)
+        for code in sorted(self.eligible_regions):
+            nome = self.REGIOES_BRASIL.get(code, code)
             eligible.append({
-                "code": code.upper(),
+                "code": code,
                 "name": nome.title(),
                 "status": "available"
             })
@@ -137,10 +163,10 @@ class RegionalValidator:
             Lista de dicts com código e nome da região
         """
         interest = []
-        for code in self.interest_regions:
-            nome = self.REGIOES_BRASIL.get(code.upper(), code)
+        for code in sorted(self.interest_regions):
+            nome = self.REGIOES_BRASIL.get(code, code)
             interest.append({
-                "code": code.upper(),
+                "code": code,
                 "name": nome.title(),
                 "status": "interest"
             })
@@ -158,7 +184,7 @@ class RegionalValidator:
             Dict com resultado da validação
         """
         status, description = self.get_region_status(region_code)
-        is_eligible = self.is_eligible(region_code)
+        is_eligible = status == "eligible"
 
         logger.info(
             "region_validated",
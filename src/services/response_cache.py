@@ -0,0 +1,107 @@
+"""
+Cache de respostas do agente para mensagens iniciais curtas.
+Saudações repetidas ("oi", "quero saber mais") não precisam de nova chamada à OpenAI.
+"""
+import hashlib
+from typing import Optional, Tuple
+import orjson
+from src.config import settings
+from src.utils.logging import get_logger
+from src.utils.redis_client import get_redis
+
+
+logger = get_logger(__name__)
+
+# Só o primeiro contato de um lead, com mensagem curta, é cacheado (evita contaminar conversas)
+MAX_CACHEABLE_MESSAGE_LENGTH = 60
+
+
+def is_cacheable(user_message: str, is_first_contact: bool) -> bool:
+    """
+    Indica se a resposta para a mensagem pode vir do cache.
+
+    Decide pelo lead (sem conversas gravadas), não pelo histórico enviado à
+    OpenAI: esse pode vir vazio por corte de orçamento ou erro na consulta.
+
+    Args:
+        user_message: Mensagem do lead
+        is_first_contact: True só para lead recém-criado
+
+    Returns:
+        True se cacheável
+    """
+    return (
+        is_first_contact
+        and settings.openai_response_cache_ttl_seconds > 0
+        and len(user_message) < MAX_CACHEABLE_MESSAGE_LENGTH
+    )
+
+
+def response_cache_key(prompt_version: str, model: str, user_message: str) -> str:
+    """
+    Monta a chave do cache (versão do prompt + modelo + mensagem normalizada).
+
+    Args:
+        prompt_version: Versão do system prompt
+        model: Modelo OpenAI
+        user_message: Mensagem do lead
+
+    Returns:
+        Chave Redis
+    """
+    normalized = " ".join(user_message.casefold().split())
+    digest = hashlib.blake2b(
+        f"{prompt_version}\0{model}\0{normalized}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    return f"reply:{digest}"
+
+
+def get_cached_response(key: str) -> Optional[Tuple[str, dict]]:
+    """
+    Busca resposta cacheada.
+
+    Args:
+        key: Chave gerada por response_cache_key
+
+    Returns:
+        Tuple (resposta, metadata) ou None se ausente/Redis indisponível
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        cached = client.get(key)
+    except Exception as e:
+        logger.warning("response_cache_redis_error", error=str(e))
+        return None
+
+    if cached is None:
+        return None
+
+    entry = orjson.loads(cached)
+    return entry["response"], entry["metadata"]
+
+
+def set_cached_response(key: str, response: str, metadata: dict) -> None:
+    """
+    Grava resposta no cache com TTL `openai_response_cache_ttl_seconds`.
+
+    Args:
+        key: Chave gerada por response_cache_key
+        response: Texto da resposta
+        metadata: Metadata da chamada original
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        client.set(
+            key,
+            orjson.dumps({"response": response, "metadata": metadata}),
+            ex=settings.openai_response_cache_ttl_seconds,
+        )
+    except Exception as e:
+        logger.warning("response_cache_redis_error", error=str(e))
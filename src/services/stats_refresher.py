@@ -0,0 +1,87 @@
+"""
+Atualização periódica das views materializadas de estatísticas.
+"""
+from typing import Optional
+from apscheduler.schedulers.background import BackgroundScheduler
+from flask import Flask
+from sqlalchemy import text
+from src.config import settings
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Chave do advisory lock: só um worker do gunicorn atualiza por vez
+_REFRESH_LOCK_KEY = 72201
+
+
+def refresh_lead_status_counts(app: Flask) -> bool:
+    """
+    Executa REFRESH MATERIALIZED VIEW CONCURRENTLY em `lead_status_counts`.
+
+    Args:
+        app: Instância Flask (o job roda fora de request)
+
+    Returns:
+        True se a view foi atualizada, False se outro worker já estava atualizando
+    """
+    with app.app_context():
+        db = app.extensions.get("sqlalchemy")
+        if not db:
+            return False
+
+        try:
+            acquired = db.session.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": _REFRESH_LOCK_KEY},
+            ).scalar()
+            if not acquired:
+                db.session.rollback()
+                return False
+
+            db.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY lead_status_counts"))
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            logger.error("lead_status_counts_refresh_error", error=str(e))
+            return False
+        finally:
+            db.session.remove()
+
+
+# Singleton scheduler
+_scheduler = None
+
+
+def start_stats_refresher(app: Flask) -> Optional[BackgroundScheduler]:
+    """
+    Agenda o refresh de `lead_status_counts` a cada
+    `lead_status_counts_refresh_seconds` (0 desliga).
+
+    Args:
+        app: Instância Flask
+
+    Returns:
+        Scheduler em execução, ou None se desligado
+    """
+    global _scheduler
+    interval = settings.lead_status_counts_refresh_seconds
+    if not interval:
+        return None
+
+    if _scheduler is None:
+        _scheduler = BackgroundScheduler(daemon=True)
+        _scheduler.add_job(
+            refresh_lead_status_counts,
+            "interval",
+            seconds=interval,
+            args=[app],
+            id="refresh_lead_status_counts",
+            max_instances=1,
+            coalesce=True,
+        )
+        _scheduler.start()
+        logger.info("stats_refresher_started", interval_seconds=interval)
+
+    return _scheduler
@@ -0,0 +1,100 @@
+"""
+Deduplicação de mensagens do webhook.
+A Evolution API reenvia webhooks em retries; cada mensagem deve ser triada uma única vez.
+"""
+import threading
+import time
+from collections import OrderedDict
+from src.config import settings
+from src.utils.logging import get_logger
+from src.utils.redis_client import get_redis
+
+
+logger = get_logger(__name__)
+
+
+class _TTLKeySet:
+    """Conjunto de chaves com expiração (fallback in-process, por worker)."""
+
+    __slots__ = ("maxsize", "ttl", "_keys", "_lock")
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._keys: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_if_absent(self, key: str) -> bool:
+        """Adiciona chave; retorna False se já existia e não expirou."""
+        now = time.monotonic()
+        with self._lock:
+            # Remove expiradas (ordem de inserção = ordem de expiração)
+            while self._keys:
+                oldest, expires_at = next(iter(self._keys.items()))
+                if expires_at > now:
+                    break
+                del self._keys[oldest]
+
+            if key in self._keys:
+                return False
+
+            self._keys[key] = now + self.ttl
+            if len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+            return True
+
+    def discard(self, key: str) -> None:
+        """Remove chave, se presente."""
+        with self._lock:
+            self._keys.pop(key, None)
+
+
+_local_keys = _TTLKeySet(maxsize=10000, ttl=settings.webhook_dedup_ttl_seconds)
+
+
+def claim_message(message_key: str) -> bool:
+    """
+    Registra mensagem como processada.
+
+    Usa `SET NX EX` no Redis (compartilhado entre workers) quando REDIS_URL
+    está configurado; caso contrário, um conjunto com TTL em memória.
+
+    Args:
+        message_key: ID da mensagem (ou chave derivada do conteúdo)
+
+    Returns:
+        True se é a primeira vez que a mensagem é vista, False se duplicada
+    """
+    key = f"msg:{message_key}"
+    client = get_redis()
+
+    if client is not None:
+        try:
+            return bool(client.set(key, "1", nx=True, ex=settings.webhook_dedup_ttl_seconds))
+        except Exception as e:
+            logger.warning("dedup_redis_error", error=str(e))
+
+    return _local_keys.add_if_absent(key)
+
+
+def release_message(message_key: str) -> None:
+    """
+    Libera mensagem reivindicada por claim_message.
+
+    Chamado quando a triagem falha, para que o reenvio da Evolution API
+    seja processado em vez de descartado como duplicado.
+
+    Args:
+        message_key: Mesma chave passada a claim_message
+    """
+    key = f"msg:{message_key}"
+    client = get_redis()
+
+    if client is not None:
+        try:
+            client.delete(key)
+        except Exception as e:
+            logger.warning("dedup_redis_error", error=str(e))
+
+    # Também no fallback local (claim pode ter caído nele com o Redis fora)
+    _local_keys.discard(key)
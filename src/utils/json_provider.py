@@ -0,0 +1,42 @@
+"""
+JSON provider do Flask baseado em orjson.
+"""
+from decimal import Decimal
+from typing import Any, Union
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+
+def _default(obj: Any) -> Any:
+    """Serializa tipos não suportados nativamente pelo orjson."""
+    if isinstance(obj, Decimal):
+        # AVG/SUM do Postgres retornam Decimal
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Substitui o encoder stdlib do `jsonify` por orjson.
+
+    datetime, UUID, Enum e dataclasses são serializados nativamente (em Rust).
+    """
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serializa para string JSON (kwargs do stdlib são ignorados)."""
+        return orjson.dumps(obj, default=_default, option=self.option).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Desserializa string ou bytes JSON."""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Cria Response JSON direto dos bytes do orjson, sem decode."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype="application/json",
+        )
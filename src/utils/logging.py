@@ -2,11 +2,33 @@
 Setup de logging estruturado com structlog.
 """
 import logging
-import json
 import sys
-from datetime import datetime
+import orjson
 import structlog
-from pythonjsonlogger import jsonlogger
+
+
+def _orjson_dumps(obj, **kwargs) -> str:
+    """Serializer do JSONRenderer com orjson (datetime/UUID nativos)."""
+    return orjson.dumps(
+        obj,
+        default=kwargs.get("default"),
+        option=orjson.OPT_NON_STR_KEYS,
+    ).decode("utf-8")
+
+
+class ORJSONFormatter(logging.Formatter):
+    """Formatter JSON de uma linha por registro, serializado com orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(log_record, default=str).decode("utf-8")
 
 
 def setup_logging(log_level: str = "INFO", environment: str = "development"):
@@ -43,7 +65,7 @@ def configure_dev_logging(level: int):
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -83,7 +105,7 @@ def configure_json_logging(level: int):
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -95,9 +117,7 @@ def configure_json_logging(level: int):
     handler.setLevel(level)
 
     # JSON formatter
-    formatter = jsonlogger.JsonFormatter(
-        "%(timestamp)s %(level)s %(name)s %(message)s"
-    )
+    formatter = ORJSONFormatter()
     handler.setFormatter(formatter)
 
     # Setup root logger
@@ -132,9 +152,8 @@ def log_webhook_received(phone: str, event: str, payload_size: int):
     get_logger("webhook").info(
         "webhook_received",
         phone=phone,
-        event=event,
+        webhook_event=event,
         payload_size=payload_size,
-        timestamp=datetime.utcnow().isoformat(),
     )
 
 
@@ -154,7 +173,6 @@ def log_openai_call(
         tokens_total=tokens_input + tokens_output,
         cost_usd=cost_usd,
         latency_ms=latency_ms,
-        timestamp=datetime.utcnow().isoformat(),
     )
 
 
@@ -165,7 +183,6 @@ def log_lead_status_change(lead_id: str, old_status: str, new_status: str):
         lead_id=lead_id,
         old_status=old_status,
         new_status=new_status,
-        timestamp=datetime.utcnow().isoformat(),
     )
 
 
@@ -175,5 +192,4 @@ def log_error(error_type: str, message: str, details: dict = None):
         error_type,
         message=message,
         details=details or {},
-        timestamp=datetime.utcnow().isoformat(),
     )
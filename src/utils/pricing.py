@@ -0,0 +1,12 @@
+"""
+Preços da OpenAI em micro-centavos de USD (1 USD = 10^8 micro-centavos).
+Aritmética inteira: chamadas abaixo de 1 centavo não se perdem no arredondamento.
+"""
+
+# Preço por token: (entrada, saída)
+# GPT-4o-mini: $0.15 por 1M tokens de entrada, $0.60 por 1M de saída
+PRICE_MICROCENTS_PER_TOKEN = {
+    "gpt-4o-mini": (15, 60),
+    "gpt-4o": (250, 1000),
+}
+MICROCENTS_PER_USD = 100_000_000
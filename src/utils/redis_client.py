@@ -0,0 +1,22 @@
+"""
+Cliente Redis compartilhado (opcional, ativado por REDIS_URL).
+"""
+from typing import Optional
+from src.config import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - Redis é opcional
+    redis = None
+
+
+# Cliente Redis singleton
+_redis_client = None
+
+
+def get_redis() -> Optional["redis.Redis"]:
+    """Retorna cliente Redis se configurado, ou None."""
+    global _redis_client
+    if _redis_client is None and redis is not None and settings.redis_url:
+        _redis_client = redis.Redis.from_url(settings.redis_url)
+    return _redis_client
@@ -3,53 +3,64 @@ Funções de segurança (autenticação, criptografia, validação de webhook).
 """
 import hmac
 import hashlib
-from typing import Optional
+import secrets
+from typing import Optional, Union
 
 
 def validate_webhook_signature(
-    body: str,
+    body: Union[str, bytes],
     signature: str,
-    secret: str,
+    secret: Union[str, bytes],
     algorithm: str = "sha256"
 ) -> bool:
     """
     Valida assinatura HMAC do webhook.
 
     Args:
-        body: Body da requisição (string)
-        signature: Signature recebida no header
-        secret: Secret compartilhado
+        body: Body da requisição (de preferência os bytes brutos)
+        signature: Signature recebida no header (hex)
+        secret: Secret compartilhado (de preferência já em bytes)
         algorithm: Algoritmo de hash (sha256, sha1, etc)
 
     Returns:
         True se assinatura é válida, False caso contrário
     """
     try:
-        # Calcula HMAC esperada
-        expected_signature = hmac.new(
-            secret.encode(),
-            body.encode(),
-            getattr(hashlib, algorithm)
-        ).hexdigest()
+        if isinstance(body, str):
+            body = body.encode()
+        if isinstance(secret, str):
+            secret = secret.encode()
+
+        # Digest bruto via OpenSSL (digestmod por nome), sem hexdigest intermediário
+        expected_digest = hmac.new(secret, body, algorithm).digest()
 
         # Comparação timing-safe para evitar timing attacks
-        return hmac.compare_digest(signature, expected_signature)
-    except Exception:
+        return hmac.compare_digest(bytes.fromhex(signature), expected_digest)
+    except (ValueError, TypeError):
         return False
 
 
+# Parâmetros do scrypt (~16 MiB de memória por hash)
+_SCRYPT_N = 2 ** 14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+
+
 def hash_password(password: str) -> str:
     """
-    Hash de senha com SHA256 (simplificado).
-    Em produção, usar bcrypt ou argon2.
+    Hash de senha com scrypt (salt aleatório, memory-hard).
 
     Args:
         password: Senha a ser hasheada
 
     Returns:
-        Hash da senha
+        Hash no formato "scrypt$n$r$p$salt_hex$hash_hex"
     """
-    return hashlib.sha256(password.encode()).hexdigest()
+    salt = secrets.token_bytes(16)
+    derived = hashlib.scrypt(
+        password.encode(), salt=salt, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P
+    )
+    return f"scrypt${_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}${salt.hex()}${derived.hex()}"
 
 
 def verify_password(password: str, hashed: str) -> bool:
@@ -58,12 +69,31 @@ def verify_password(password: str, hashed: str) -> bool:
 
     Args:
         password: Senha fornecida
-        hashed: Hash armazenado
+        hashed: Hash armazenado (gerado por hash_password)
 
     Returns:
-        True se senha é correta
+        True se senha é correta (False para hash vazio, malformado ou de outro esquema)
     """
-    return hash_password(password) == hashed
+    if not isinstance(hashed, str):
+        return False
+
+    try:
+        scheme, n, r, p, salt_hex, hash_hex = hashed.split("$")
+        if scheme != "scrypt":
+            return False
+        expected = bytes.fromhex(hash_hex)
+        derived = hashlib.scrypt(
+            password.encode(),
+            salt=bytes.fromhex(salt_hex),
+            n=int(n),
+            r=int(r),
+            p=int(p),
+            dklen=len(expected),
+        )
+    except ValueError:
+        return False
+
+    return hmac.compare_digest(derived, expected)
 
 
 def generate_bearer_token() -> str:
@@ -73,7 +103,6 @@ def generate_bearer_token() -> str:
     Returns:
         Token aleatório de 32 caracteres
     """
-    import secrets
     return secrets.token_urlsafe(32)
 
 
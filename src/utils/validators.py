@@ -2,7 +2,40 @@
 Validadores customizados para inputs do sistema.
 """
 import re
-from typing import List, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Union
+
+
+# Tabelas de str.translate (executam em C, sem loop Python por caractere)
+# Remove tudo que não é dígito ASCII no intervalo Latin-1
+_STRIP_NON_DIGITS = str.maketrans("", "", "".join(
+    chr(i) for i in range(256) if not "0" <= chr(i) <= "9"
+))
+# Remove caracteres de controle C0, exceto \t e \n (usada também pelos schemas)
+CONTROL_CHARS_TABLE = dict.fromkeys(i for i in range(32) if i not in (9, 10))
+
+# Padrões compilados uma única vez (sem lookup no cache do `re` a cada chamada)
+_PHONE_NONDIGIT_RE = re.compile(r"\D")
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+def digits_only(phone: str) -> str:
+    """
+    Remove tudo que não é dígito do telefone.
+
+    Args:
+        phone: Telefone com ou sem separadores (ex: "+55 (11) 99999-9999")
+
+    Returns:
+        Somente os dígitos
+    """
+    clean = phone.translate(_STRIP_NON_DIGITS)
+    if not clean.isascii():
+        # Sobrou caractere fora do Latin-1 (ex: travessão, hífen não separável):
+        # regex como fallback
+        clean = _PHONE_NONDIGIT_RE.sub("", phone)
+    return clean
 
 
 def validate_phone(phone: str) -> bool:
@@ -21,26 +54,36 @@ def validate_phone(phone: str) -> bool:
         True se válido, False caso contrário
     """
     # Remove caracteres especiais
-    clean = re.sub(r"\D", "", phone)
+    clean = digits_only(phone)
 
     # Valida comprimento
     if len(clean) < 10 or len(clean) > 15:
         return False
 
-    # Verifica se tem pelo menos um dígito que não seja 0
-    if all(c == "0" for c in clean):
+    # Verifica se tem pelo menos um dígito que não seja 0 (lstrip para no primeiro)
+    if not clean.lstrip("0"):
         return False
 
     return True
 
 
-def validate_region(region: str, valid_regions: List[str]) -> bool:
+@lru_cache(maxsize=32)
+def _upper_set(regions: FrozenSet[str]) -> FrozenSet[str]:
+    """Regiões em maiúsculas, calculado uma vez por frozenset (hash do frozenset fica em cache)."""
+    return frozenset(r.upper() for r in regions)
+
+
+def validate_region(region: str, valid_regions: Union[FrozenSet[str], Iterable[str]]) -> bool:
     """
-    Valida se região está na lista de regiões válidas.
+    Valida se região está na lista de regiões válidas (sem diferenciar maiúsculas).
+
+    Passe um frozenset montado uma vez (ex: settings.eligible_regions): a versão
+    em maiúsculas fica em cache e a verificação é O(1). Outras coleções são
+    aceitas por compatibilidade, mas percorridas a cada chamada.
 
     Args:
         region: Código de região (ex: "RS", "SP")
-        valid_regions: Lista de regiões válidas
+        valid_regions: Regiões válidas (de preferência frozenset)
 
     Returns:
         True se válido, False caso contrário
@@ -49,7 +92,10 @@ def validate_region(region: str, valid_regions: List[str]) -> bool:
         return False
 
     region_upper = region.upper()
-    return region_upper in [r.upper() for r in valid_regions]
+    if isinstance(valid_regions, frozenset):
+        return region_upper in _upper_set(valid_regions)
+
+    return any(r.upper() == region_upper for r in valid_regions)
 
 
 def validate_email(email: str) -> bool:
@@ -62,8 +108,14 @@ def validate_email(email: str) -> bool:
     Returns:
         True se válido, False caso contrário
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    # Rejeição rápida sem regex: precisa de "@" e de "." no domínio
+    if not email:
+        return False
+    at_idx = email.rfind("@")
+    if at_idx <= 0 or "." not in email[at_idx + 1:]:
+        return False
+
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_horario(horario: str, inicio: int = 9, fim: int = 18) -> bool:
@@ -78,34 +130,54 @@ def validate_horario(horario: str, inicio: int = 9, fim: int = 18) -> bool:
     Returns:
         True se válido e em horário comercial
     """
-    try:
-        pattern = r'^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$'
-        if not re.match(pattern, horario):
-            return False
+    # Aceita também H:MM (ex: "9:30"), como o formato antigo com hora de 1 dígito
+    if len(horario) == 4:
+        horario = "0" + horario
+    if len(horario) != 5 or horario[2] != ":":
+        return False
 
-        horas = int(horario.split(":")[0])
-        return inicio <= horas < fim
+    h1, h2, m1, m2 = horario[0], horario[1], horario[3], horario[4]
+    if not ("0" <= h1 <= "2" and "0" <= h2 <= "9" and "0" <= m1 <= "5" and "0" <= m2 <= "9"):
+        return False
 
-    except (ValueError, IndexError):
+    # Aritmética direta nos caracteres, sem regex/split/int
+    horas = (ord(h1) - 48) * 10 + (ord(h2) - 48)
+    if horas > 23:
         return False
 
+    return inicio <= horas < fim
 
-def validate_data_futura(data_str: str, formato: str = "%d/%m/%Y") -> bool:
+
+def validate_data_futura(
+    data_str: str,
+    formato: str = "%d/%m/%Y",
+    now: Optional[datetime] = None,
+) -> bool:
     """
     Valida se data é futura.
 
     Args:
         data_str: Data em string (formato padrão: DD/MM/YYYY)
         formato: Formato da data (padrão "%d/%m/%Y")
+        now: Referência de "agora" (padrão: datetime.now())
 
     Returns:
         True se data é futura, False caso contrário
     """
-    from datetime import datetime
-
     try:
-        data = datetime.strptime(data_str, formato)
-        return data > datetime.now()
+        if (
+            formato == "%d/%m/%Y"
+            and len(data_str) == 10
+            and data_str[2] == "/"
+            and data_str[5] == "/"
+            and data_str.isascii()
+            and (data_str[:2] + data_str[3:5] + data_str[6:]).isdigit()
+        ):
+            # DD/MM/YYYY montado direto, sem passar pelo parser do strptime
+            data = datetime(int(data_str[6:]), int(data_str[3:5]), int(data_str[:2]))
+        else:
+            data = datetime.strptime(data_str, formato)
+        return data > (now or datetime.now())
     except ValueError:
         return False
 
@@ -124,8 +196,8 @@ def sanitize_text(text: str, max_length: int = 5000) -> str:
     if not text:
         return ""
 
-    # Remove caracteres de controle (< 32, exceto \n e \t)
-    clean = "".join(c for c in text if ord(c) >= 32 or c in "\n\t")
+    # Remove caracteres de controle (< 32, exceto \n e \t) em uma passada em C
+    clean = text.translate(CONTROL_CHARS_TABLE)
 
     # Limita comprimento
     return clean[:max_length]
@@ -147,7 +219,11 @@ def extrair_telefone_whatsapp(remote_jid: str) -> Optional[str]:
         return None
 
     # Remove @s.whatsapp.net
-    phone = remote_jid.split("@")[0]
+    phone = remote_jid.partition("@")[0]
+
+    # Caminho rápido: JID padrão só com dígitos ASCII, sem passar por regex
+    if phone.isascii() and phone.isdigit():
+        return phone if 10 <= len(phone) <= 15 and phone.lstrip("0") else None
 
     if validate_phone(phone):
         return phone
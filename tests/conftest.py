@@ -4,8 +4,8 @@ Configuração e fixtures compartilhadas para testes.
 import pytest
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 # Carregar .env de teste
 load_dotenv(".env.test", override=True)
@@ -19,6 +19,9 @@ os.environ["EVOLUTION_API_KEY"] = "test-key"
 os.environ["EVOLUTION_INSTANCE_ID"] = "test-instance"
 os.environ["WEBHOOK_SECRET"] = "test-webhook-secret-min-32-chars"
 os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["WEBHOOK_ASYNC_PROCESSING"] = "false"
+# Sem SMTP nos testes (o Settings exige SMTP_* com notificações ligadas)
+os.environ["FEATURE_NOTIFICATIONS"] = "false"
 
 
 @pytest.fixture(scope="session")
@@ -26,30 +29,57 @@ def app():
     """Cria aplicação Flask para testes."""
     from src.app import create_app
 
-    app, db = create_app()
+    app = create_app()
     app.config["TESTING"] = True
 
     with app.app_context():
         yield app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app):
-    """Cria cliente Flask para fazer requisições."""
+    """Cria cliente Flask para fazer requisições (um por sessão de testes)."""
     return app.test_client()
 
 
+@pytest.fixture(scope="session")
+def _schema(app):
+    """Cria o schema uma única vez por sessão de testes."""
+    db = app.extensions["sqlalchemy"]
+    db.create_all()
+    yield db
+    db.drop_all()
+
+
 @pytest.fixture
-def db(app):
-    """Cria sessão de banco de dados para testes."""
-    from src.app import create_app
+def db(_schema, monkeypatch):
+    """
+    Sessão de banco de dados para testes (mesmo SQLAlchemy da app).
+
+    Cada teste roda dentro de uma transação externa que é desfeita no final;
+    os commits do código viram SAVEPOINTs (join_transaction_mode="create_savepoint").
+    """
+    connection = _schema.engine.connect()
+    is_sqlite = connection.dialect.name == "sqlite"
+    if is_sqlite:
+        # pysqlite não emite BEGIN/SAVEPOINT sozinho; assume o controle da transação
+        dbapi_connection = connection.connection.driver_connection
+        isolation_level = dbapi_connection.isolation_level
+        dbapi_connection.isolation_level = None
+        event.listen(connection, "begin", lambda conn: conn.exec_driver_sql("BEGIN"))
+    transaction = connection.begin()
+    session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    monkeypatch.setattr(_schema, "session", session)
 
-    _, db = create_app()
-    with app.app_context():
-        db.create_all()
-        yield db
-        db.session.remove()
-        db.drop_all()
+    yield _schema
+
+    session.remove()
+    transaction.rollback()
+    if is_sqlite:
+        dbapi_connection.isolation_level = isolation_level
+    connection.close()
 
 
 @pytest.fixture
@@ -81,18 +111,43 @@ class MockOpenAIResponse:
         self.usage = MockOpenAIResponse.Usage()
 
 
+# Resposta padrão compartilhada entre testes (montada uma vez)
+_DEFAULT_OPENAI_RESPONSE = MockOpenAIResponse("Olá! Como posso ajudar você?")
+
+
+class _StubCompletions:
+    """Stub de `client.chat.completions` (objeto simples, sem MagicMock)."""
+
+    def __init__(self, response):
+        self.response = response
+
+    def create(self, *args, **kwargs):
+        return self.response
+
+
+class _StubChat:
+    """Stub de `client.chat`."""
+
+    def __init__(self, response):
+        self.completions = _StubCompletions(response)
+
+
+class _StubOpenAI:
+    """Stub do cliente OpenAI com só o que o agente usa."""
+
+    def __init__(self, response=_DEFAULT_OPENAI_RESPONSE):
+        self.chat = _StubChat(response)
+
+
 @pytest.fixture
-def mock_openai(mocker):
+def mock_openai(monkeypatch):
     """Mock da API OpenAI."""
-    def create_mock_response(content):
-        return MockOpenAIResponse(content)
-
-    mock = mocker.patch("src.services.openai_agent.OpenAI")
-    mock.return_value.chat.completions.create.return_value = create_mock_response(
-        "Olá! Como posso ajudar você?"
-    )
+    stub = _StubOpenAI()
+    monkeypatch.setattr("src.services.openai_agent.OpenAI", lambda *args, **kwargs: stub)
+    # Agente singleton recriado com o cliente stub
+    monkeypatch.setattr("src.services.openai_agent._agent", None)
 
-    return mock
+    return stub
 
 
 # Fixtures de dados de teste
@@ -0,0 +1,66 @@
+"""Testes de integração das rotas administrativas."""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query
+from src.api.admin import MAX_OFFSET
+from src.models.lead import Lead, LeadStatus
+
+
+@pytest.fixture
+def leads(db):
+    """Cinco leads com created_at distintos (mais novo primeiro)."""
+    base = datetime(2026, 1, 1, 12, 0)
+    rows = [
+        Lead(phone=f"551199999000{i}", status=LeadStatus.NOVO, created_at=base - timedelta(minutes=i))
+        for i in range(5)
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+@pytest.mark.integration
+class TestAdminLeads:
+    """Testes de /api/admin/leads."""
+
+    def test_erro_de_banco_retorna_500(self, client, db, mocker):
+        """Erro ao ler as linhas vira 500, não um 200 com JSON truncado."""
+        mocker.patch.object(Query, "all", side_effect=OperationalError("SELECT", {}, Exception("boom")))
+
+        response = client.get("/api/admin/leads")
+
+        assert response.status_code == 500
+        assert response.get_json()["error"] == "internal_error"
+
+    def test_cursor_percorre_todas_as_paginas(self, client, leads):
+        """next_cursor de uma página alimenta a próxima, sem repetir nem pular leads."""
+        response = client.get("/api/admin/leads?limit=2")
+        body = response.get_json()
+        assert body["total"] == 5
+        phones = [lead["phone"] for lead in body["leads"]]
+
+        while body["next_cursor"]:
+            response = client.get("/api/admin/leads", query_string={"limit": 2, **body["next_cursor"]})
+            assert response.status_code == 200
+            body = response.get_json()
+            assert body["total"] is None  # Não recalculado nas páginas por cursor
+            phones += [lead["phone"] for lead in body["leads"]]
+
+        assert phones == [lead.phone for lead in leads]
+
+    @pytest.mark.parametrize("query_string", [
+        {"after_created_at": "2026-01-01T12:00:00"},  # Sem after_id
+        {"after_id": "00000000-0000-0000-0000-000000000001"},  # Sem after_created_at
+        {"after_created_at": "ontem", "after_id": "00000000-0000-0000-0000-000000000001"},
+        {"after_created_at": "2026-01-01T12:00:00", "after_id": "nao-e-uuid"},
+    ])
+    def test_cursor_invalido_retorna_400(self, client, db, query_string):
+        """Cursor inválido ou incompleto é rejeitado."""
+        response = client.get("/api/admin/leads", query_string=query_string)
+        assert response.status_code == 400
+
+    def test_offset_acima_do_maximo_retorna_400(self, client, db):
+        """Offset além de MAX_OFFSET exige cursor."""
+        response = client.get(f"/api/admin/leads?offset={MAX_OFFSET + 1}")
+        assert response.status_code == 400
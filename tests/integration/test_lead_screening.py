@@ -0,0 +1,72 @@
+"""Testes de integração do serviço de triagem."""
+import pytest
+from src.config import settings
+from src.models.lead import Lead, LeadStatus
+from src.services.lead_screening import LeadScreening
+
+
+class _AgentSemChamadas:
+    """Agente que falha se for consultado (UF conhecida não deve chegar nele)."""
+
+    def check_eligibility(self, *args, **kwargs):
+        raise AssertionError("check_eligibility não deveria ser chamado")
+
+
+class _AgentRegistrador:
+    """Agente que registra os argumentos de generate_response."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_response(self, **kwargs):
+        self.calls.append(kwargs)
+        return "Olá!", {"tokens_total": 30}
+
+
+@pytest.mark.integration
+class TestReceiveLeadMessage:
+    """Testes de receive_lead_message."""
+
+    def test_so_o_primeiro_contato_e_cacheavel(self, db, monkeypatch):
+        """Lead com conversa gravada não usa o cache, mesmo com histórico vazio após o corte."""
+        monkeypatch.setattr(settings, "openai_history_max_tokens", 0)
+        agent = _AgentRegistrador()
+        screening = LeadScreening(db.session, agent=agent)
+
+        screening.receive_lead_message("5511999999999@s.whatsapp.net", "oi")
+        screening.receive_lead_message("5511999999999@s.whatsapp.net", "sim")
+
+        first, second = agent.calls
+        assert first["is_first_contact"] is True
+        assert second["conversation_history"] == []
+        assert second["is_first_contact"] is False
+
+
+@pytest.mark.integration
+class TestValidateLeadEligibility:
+    """Testes de validate_lead_eligibility."""
+
+    @pytest.mark.parametrize("regiao,elegivel,description,status", [
+        ("RS", True, "Ótimo! A região RS é elegível para franquias.", LeadStatus.AGUARDANDO_RESPOSTA),
+        (
+            "BA",
+            False,
+            "A região BA ainda não está aberta para implantações, "
+            "mas vamos registrar seu interesse para futuras expansões.",
+            LeadStatus.NAO_ELEGIVEL,
+        ),
+    ])
+    def test_uf_conhecida(self, db, regiao, elegivel, description, status):
+        """UF conhecida é decidida pelo validador, com a mesma explicação do agente."""
+        lead = Lead(phone="5511999999999", status=LeadStatus.EM_TRIAGEM, regiao=regiao)
+        db.session.add(lead)
+        db.session.commit()
+
+        result = LeadScreening(db.session, agent=_AgentSemChamadas()).validate_lead_eligibility(
+            str(lead.id)
+        )
+
+        assert result["success"] is True
+        assert result["is_eligible"] is elegivel
+        assert result["description"] == description
+        assert lead.status == status
@@ -0,0 +1,176 @@
+"""Testes de integração do webhook da Evolution API."""
+import hashlib
+import hmac
+import os
+import orjson
+import pytest
+from src.config import settings
+from src.services import message_queue
+from src.services.lead_screening import LeadScreening
+from src.utils import idempotency
+
+
+_WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+_AUTH_HEADERS = {"Authorization": f"Bearer {_WEBHOOK_SECRET}"}
+
+
+def _body(message_id: str = "BAE5123", text: str = "Olá") -> bytes:
+    """Payload do webhook com uma mensagem."""
+    return orjson.dumps({
+        "event": "messages.upsert",
+        "data": {
+            "instanceId": "test-instance",
+            "messages": [{
+                "remoteJid": "5511999999999@s.whatsapp.net",
+                "fromMe": False,
+                "id": message_id,
+                "conversation": text,
+            }],
+        },
+    })
+
+
+def _body_dois_leads() -> bytes:
+    """Payload do webhook com mensagens de dois telefones."""
+    return orjson.dumps({
+        "event": "messages.upsert",
+        "data": {
+            "instanceId": "test-instance",
+            "messages": [
+                {
+                    "remoteJid": f"55119999999{i}@s.whatsapp.net",
+                    "fromMe": False,
+                    "id": f"BAE5{i}",
+                    "conversation": "Olá",
+                }
+                for i in (10, 20)
+            ],
+        },
+    })
+
+
+def _sign(body: bytes, secret: str = _WEBHOOK_SECRET) -> str:
+    """X-Signature: HMAC-SHA256 hex do body bruto."""
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _post(client, body: bytes, headers: dict):
+    return client.post(
+        "/api/webhooks/evolution",
+        data=body,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+@pytest.fixture(autouse=True)
+def local_keys(monkeypatch):
+    """Deduplicação em memória limpa por teste."""
+    monkeypatch.setattr(idempotency, "_local_keys", idempotency._TTLKeySet(maxsize=100, ttl=60))
+    monkeypatch.setattr(idempotency, "get_redis", lambda: None)
+
+
+@pytest.mark.integration
+class TestWebhookAuthentication:
+    """Testes de autenticação (X-Signature e Bearer)."""
+
+    @pytest.fixture(autouse=True)
+    def screening(self, mocker):
+        return mocker.patch.object(
+            LeadScreening, "receive_lead_message", return_value={"success": True}
+        )
+
+    def test_assinatura_valida(self, client):
+        """X-Signature correto autentica sem Bearer."""
+        body = _body()
+        assert _post(client, body, {"X-Signature": _sign(body)}).status_code == 200
+
+    @pytest.mark.parametrize("signature", [
+        _sign(_body(), secret="outro-secret-com-pelo-menos-32-chars"),  # Secret errado
+        _sign(b"outro body"),  # Body diferente do assinado
+        "nao-e-hex",
+        "abcd",  # Hex com tamanho errado
+    ])
+    def test_assinatura_invalida(self, client, screening, signature):
+        """Assinatura errada, não-hex ou de tamanho errado é recusada."""
+        response = _post(client, _body(), {"X-Signature": signature})
+
+        assert response.status_code == 401
+        assert screening.call_count == 0
+
+    def test_assinatura_invalida_nao_cai_no_bearer(self, client):
+        """Com X-Signature presente, Bearer válido não é considerado."""
+        headers = {"X-Signature": "00" * 32, **_AUTH_HEADERS}
+        assert _post(client, _body(), headers).status_code == 401
+
+    @pytest.mark.parametrize("allow_bearer,expected", [(True, 200), (False, 401)])
+    def test_bearer_fallback(self, client, monkeypatch, allow_bearer, expected):
+        """Bearer só é aceito com webhook_allow_bearer_auth ligado."""
+        monkeypatch.setattr(settings, "webhook_allow_bearer_auth", allow_bearer)
+        assert _post(client, _body(), _AUTH_HEADERS).status_code == expected
+
+    def test_sem_credenciais(self, client):
+        """Sem X-Signature nem Bearer, 401."""
+        assert _post(client, _body(), {}).status_code == 401
+
+
+@pytest.mark.integration
+class TestWebhookDeduplication:
+    """Testes de deduplicação de mensagens."""
+
+    def test_reenvio_e_ignorado(self, client, mocker):
+        """A mesma mensagem entregue duas vezes é triada uma vez."""
+        screen = mocker.patch.object(
+            LeadScreening, "receive_lead_message", return_value={"success": True}
+        )
+
+        assert _post(client, _body(), _AUTH_HEADERS).status_code == 200
+        assert _post(client, _body(), _AUTH_HEADERS).status_code == 200
+        assert screen.call_count == 1
+
+    def test_reenvio_apos_falha_e_processado(self, client, mocker):
+        """Triagem que falhou libera a mensagem para o reenvio."""
+        screen = mocker.patch.object(
+            LeadScreening,
+            "receive_lead_message",
+            side_effect=[{"success": False, "error": "boom"}, {"success": True}],
+        )
+
+        _post(client, _body(), _AUTH_HEADERS)
+        _post(client, _body(), _AUTH_HEADERS)
+        assert screen.call_count == 2
+
+    def test_reenvio_apos_excecao_e_processado(self, client, mocker):
+        """Exceção na triagem também libera a mensagem."""
+        screen = mocker.patch.object(
+            LeadScreening,
+            "receive_lead_message",
+            side_effect=[RuntimeError("boom"), {"success": True}],
+        )
+
+        assert _post(client, _body(), _AUTH_HEADERS).status_code == 500
+        assert _post(client, _body(), _AUTH_HEADERS).status_code == 200
+        assert screen.call_count == 2
+
+    def test_falha_libera_telefones_seguintes(self, client, mocker):
+        """Falha na triagem de um telefone libera também os que não foram processados."""
+        screen = mocker.patch.object(
+            LeadScreening,
+            "receive_lead_message",
+            side_effect=[RuntimeError("boom"), {"success": True}, {"success": True}],
+        )
+
+        assert _post(client, _body_dois_leads(), _AUTH_HEADERS).status_code == 500
+        assert _post(client, _body_dois_leads(), _AUTH_HEADERS).status_code == 200
+        assert screen.call_count == 3
+
+    def test_submit_falho_libera_chaves(self, client, mocker, monkeypatch):
+        """No modo assíncrono, erro no submit ao executor libera as chaves."""
+        monkeypatch.setattr(settings, "webhook_async_processing", True)
+        executor = mocker.Mock()
+        executor.submit.side_effect = RuntimeError("cannot schedule new futures after shutdown")
+        monkeypatch.setattr(message_queue, "get_executor", lambda: executor)
+
+        assert _post(client, _body_dois_leads(), _AUTH_HEADERS).status_code == 500
+        assert idempotency.claim_message("BAE510") is True
+        assert idempotency.claim_message("BAE520") is True
@@ -0,0 +1,27 @@
+"""Testes unitários para configuração."""
+import pytest
+from src.config import Settings
+
+
+@pytest.mark.unit
+class TestSettings:
+    """Testes de Settings."""
+
+    def test_regioes_csv_do_ambiente(self, monkeypatch):
+        """ELIGIBLE_REGIONS/INTEREST_REGIONS em CSV viram frozenset em maiúsculas."""
+        monkeypatch.setenv("ELIGIBLE_REGIONS", "rs, sp ,,mg")
+        monkeypatch.setenv("INTEREST_REGIONS", "ba")
+
+        settings = Settings(_env_file=None)
+
+        assert settings.eligible_regions == frozenset({"RS", "SP", "MG"})
+        assert settings.interest_regions == frozenset({"BA"})
+
+    def test_regioes_padrao(self, monkeypatch):
+        """Sem variável de ambiente, o padrão já é frozenset."""
+        monkeypatch.delenv("ELIGIBLE_REGIONS", raising=False)
+
+        settings = Settings(_env_file=None)
+
+        assert isinstance(settings.eligible_regions, frozenset)
+        assert "RS" in settings.eligible_regions
@@ -0,0 +1,97 @@
+"""Testes unitários para deduplicação de mensagens do webhook."""
+from types import SimpleNamespace
+import pytest
+from src.utils import idempotency
+from src.utils.idempotency import _TTLKeySet, claim_message, release_message
+
+
+class _FakeRedis:
+    """Redis mínimo com SET NX e DELETE."""
+
+    def __init__(self, fail=False):
+        self.data = {}
+        self.fail = fail
+
+    def set(self, key, value, nx=False, ex=None):
+        if self.fail:
+            raise ConnectionError("redis fora do ar")
+        if nx and key in self.data:
+            return None
+        self.data[key] = (value, ex)
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def local_keys(monkeypatch):
+    """Fallback in-process limpo, sem Redis."""
+    keys = _TTLKeySet(maxsize=100, ttl=60)
+    monkeypatch.setattr(idempotency, "_local_keys", keys)
+    monkeypatch.setattr(idempotency, "get_redis", lambda: None)
+    return keys
+
+
+@pytest.mark.unit
+class TestTTLKeySet:
+    """Testes do conjunto com expiração."""
+
+    def test_expira_apos_ttl(self, monkeypatch):
+        """Chave volta a ser aceita depois do TTL."""
+        clock = [100.0]
+        monkeypatch.setattr(idempotency, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        keys = _TTLKeySet(maxsize=10, ttl=60)
+
+        assert keys.add_if_absent("a") is True
+        clock[0] += 59
+        assert keys.add_if_absent("a") is False
+        clock[0] += 1
+        assert keys.add_if_absent("a") is True
+
+    def test_descarta_mais_antiga_acima_do_maxsize(self):
+        """Acima do maxsize a chave mais antiga sai primeiro."""
+        keys = _TTLKeySet(maxsize=2, ttl=60)
+        for key in ("a", "b", "c"):
+            assert keys.add_if_absent(key) is True
+
+        assert keys.add_if_absent("a") is True  # "a" foi descartada
+        assert keys.add_if_absent("c") is False
+
+
+@pytest.mark.unit
+class TestClaimMessage:
+    """Testes de claim_message/release_message."""
+
+    def test_duplicada_sem_redis(self, local_keys):
+        """Segunda reivindicação da mesma mensagem é recusada."""
+        assert claim_message("BAE5") is True
+        assert claim_message("BAE5") is False
+        assert claim_message("BAE6") is True
+
+    def test_redis_set_nx(self, local_keys, monkeypatch):
+        """Com Redis, usa SET NX com TTL de deduplicação."""
+        redis = _FakeRedis()
+        monkeypatch.setattr(idempotency, "get_redis", lambda: redis)
+
+        assert claim_message("BAE5") is True
+        assert claim_message("BAE5") is False
+        assert redis.data["msg:BAE5"][1] == idempotency.settings.webhook_dedup_ttl_seconds
+
+    def test_redis_indisponivel_cai_no_fallback(self, local_keys, monkeypatch):
+        """Erro no Redis usa o conjunto em memória."""
+        monkeypatch.setattr(idempotency, "get_redis", lambda: _FakeRedis(fail=True))
+
+        assert claim_message("BAE5") is True
+        assert claim_message("BAE5") is False
+
+    @pytest.mark.parametrize("with_redis", [False, True])
+    def test_release_permite_reprocessar(self, local_keys, monkeypatch, with_redis):
+        """Mensagem liberada após falha pode ser reivindicada de novo."""
+        if with_redis:
+            redis = _FakeRedis()
+            monkeypatch.setattr(idempotency, "get_redis", lambda: redis)
+
+        assert claim_message("BAE5") is True
+        release_message("BAE5")
+        assert claim_message("BAE5") is True
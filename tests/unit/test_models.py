@@ -0,0 +1,27 @@
+"""Testes unitários para models."""
+import uuid
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.models import Base, Lead, Conversation
+from src.models.lead import LeadStatus
+
+
+@pytest.mark.unit
+class TestModels:
+    """Testes de models."""
+
+    def test_uuid_primary_key_gerado_no_sqlite(self):
+        """Testa schema no SQLite e id gerado pelo server_default."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            lead = Lead(phone="5511999999999", status=LeadStatus.NOVO)
+            session.add(lead)
+            session.flush()
+            assert isinstance(lead.id, uuid.UUID)
+
+            session.add(Conversation(lead_id=lead.id, mensagem_entrada="oi", mensagem_saida="olá"))
+            session.commit()
+            assert session.get(Lead, lead.id).conversations[0].lead_id == lead.id
@@ -0,0 +1,23 @@
+"""Testes unitários para o cache de respostas do agente."""
+import pytest
+from src.config import settings
+from src.services.response_cache import MAX_CACHEABLE_MESSAGE_LENGTH, is_cacheable
+
+
+@pytest.mark.unit
+class TestIsCacheable:
+    """Testes de is_cacheable."""
+
+    @pytest.mark.parametrize("message,is_first_contact,ok", [
+        ("oi", True, True),
+        ("sim", False, False),  # Lead com conversa anterior, mesmo sem histórico enviado
+        ("a" * MAX_CACHEABLE_MESSAGE_LENGTH, True, False),  # Mensagem longa
+    ])
+    def test_is_cacheable(self, message, is_first_contact, ok):
+        """Só a primeira mensagem curta de um lead novo é cacheável."""
+        assert is_cacheable(message, is_first_contact) is ok
+
+    def test_desligado_por_ttl_zero(self, monkeypatch):
+        """TTL 0 desliga o cache."""
+        monkeypatch.setattr(settings, "openai_response_cache_ttl_seconds", 0)
+        assert is_cacheable("oi", True) is False
@@ -0,0 +1,41 @@
+"""Testes unitários para schemas Pydantic."""
+import pytest
+from pydantic import ValidationError
+from src.schemas.payloads import ConversationSchema, LeadSchema
+
+
+@pytest.mark.unit
+class TestLeadSchema:
+    """Testes de LeadSchema."""
+
+    @pytest.mark.parametrize("phone,expected", [
+        ("5511999999999", "5511999999999"),
+        ("+55 (11) 99999-9999", "5511999999999"),
+        ("11\u201399999\u20139999", "11999999999"),  # Travessão
+        ("+55 (11) 99999\u20119999", "5511999999999"),  # Hífen não separável (U+2011)
+    ])
+    def test_phone_normalizado(self, phone, expected):
+        """Separadores, inclusive fora do Latin-1, são removidos."""
+        assert LeadSchema(phone=phone).phone == expected
+
+    @pytest.mark.parametrize("phone", ["(11) 9999-99", "1" * 16])
+    def test_phone_invalido(self, phone):
+        """Menos de 10 ou mais de 15 dígitos é rejeitado."""
+        with pytest.raises(ValidationError):
+            LeadSchema(phone=phone)
+
+
+@pytest.mark.unit
+class TestConversationSchema:
+    """Testes de ConversationSchema."""
+
+    def test_remove_caracteres_de_controle(self):
+        """Controle C0 sai; \\n e \\t ficam."""
+        conv = ConversationSchema(
+            lead_id="1",
+            mensagem_entrada="Olá\x00\x1b mundo\nlinha 2",
+            mensagem_saida="ok\tfim",
+        )
+
+        assert conv.mensagem_entrada == "Olá mundo\nlinha 2"
+        assert conv.mensagem_saida == "ok\tfim"
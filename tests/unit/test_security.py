@@ -0,0 +1,62 @@
+"""Testes unitários para funções de segurança."""
+import hashlib
+import hmac
+import pytest
+from src.utils.security import hash_password, validate_webhook_signature, verify_password
+
+
+_SECRET = b"test-webhook-secret-min-32-chars"
+_BODY = b'{"event": "messages.upsert"}'
+_SIGNATURE = hmac.new(_SECRET, _BODY, hashlib.sha256).hexdigest()
+
+
+@pytest.mark.unit
+class TestWebhookSignature:
+    """Testes de validate_webhook_signature."""
+
+    def test_assinatura_valida(self):
+        """Aceita bytes ou str no body e no secret, e hex maiúsculo."""
+        assert validate_webhook_signature(_BODY, _SIGNATURE, _SECRET) is True
+        assert validate_webhook_signature(_BODY.decode(), _SIGNATURE, _SECRET.decode()) is True
+        assert validate_webhook_signature(_BODY, _SIGNATURE.upper(), _SECRET) is True
+
+    @pytest.mark.parametrize("body,signature", [
+        (b"outro body", _SIGNATURE),
+        (_BODY, "00" * 32),
+        (_BODY, "nao-e-hex"),
+        (_BODY, _SIGNATURE[:-2]),  # Tamanho errado
+        (_BODY, ""),
+    ])
+    def test_assinatura_invalida(self, body, signature):
+        """Assinatura errada, não-hex ou de tamanho errado retorna False."""
+        assert validate_webhook_signature(body, signature, _SECRET) is False
+
+
+@pytest.mark.unit
+class TestPasswordHash:
+    """Testes de hash_password/verify_password."""
+
+    def test_round_trip(self):
+        """Hash scrypt com salt aleatório verifica a mesma senha."""
+        hashed = hash_password("s3nha-forte")
+
+        assert hashed.startswith("scrypt$")
+        assert hashed != hash_password("s3nha-forte")  # Salt diferente a cada hash
+        assert verify_password("s3nha-forte", hashed) is True
+
+    def test_senha_errada(self):
+        """Senha diferente não verifica."""
+        assert verify_password("outra-senha", hash_password("s3nha-forte")) is False
+
+    @pytest.mark.parametrize("hashed", [
+        None,
+        "",
+        hashlib.sha256(b"s3nha-forte").hexdigest(),  # Hash SHA256 legado
+        "bcrypt$16384$8$1$00$00",  # Outro esquema
+        "scrypt$16384$8$1$nao-hex$00",
+        "scrypt$abc$8$1$00$00",
+        "scrypt$16384$8$1$00",  # Campos faltando
+    ])
+    def test_hash_malformado_ou_legado(self, hashed):
+        """Hash malformado, vazio ou de outro esquema retorna False."""
+        assert verify_password("s3nha-forte", hashed) is False
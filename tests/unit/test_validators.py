@@ -1,5 +1,6 @@
 """Testes unitários para validadores."""
 import pytest
+from datetime import datetime, timedelta
 from src.utils.validators import (
     validate_phone,
     validate_region,
@@ -7,6 +8,7 @@ from src.utils.validators import (
     validate_horario,
     validate_data_futura,
     sanitize_text,
+    extrair_telefone_whatsapp,
 )
 
 
@@ -14,79 +16,89 @@ from src.utils.validators import (
 class TestValidators:
     """Testes de validadores."""
 
-    def test_validate_phone_valid(self):
-        """Testa validação de telefone válido."""
-        assert validate_phone("11999999999") is True
-        assert validate_phone("5511999999999") is True
-        assert validate_phone("11-99999-9999") is True
+    @pytest.mark.parametrize("phone,ok", [
+        ("11999999999", True),
+        ("5511999999999", True),
+        ("11-99999-9999", True),
+        ("11\u201399999\u20139999", True),  # Travessão (fora do Latin-1)
+        ("123", False),  # Muito curto
+        ("", False),  # Vazio
+        ("00000000000", False),  # Todos zeros
+    ])
+    def test_validate_phone(self, phone, ok):
+        """Testa validação de telefone."""
+        assert validate_phone(phone) is ok
 
-    def test_validate_phone_invalid(self):
-        """Testa validação de telefone inválido."""
-        assert validate_phone("123") is False  # Muito curto
-        assert validate_phone("") is False  # Vazio
-        assert validate_phone("00000000000") is False  # Todos zeros
+    @pytest.mark.parametrize("email,ok", [
+        ("user@example.com", True),
+        ("john.doe@example.co.uk", True),
+        ("invalid", False),
+        ("@example.com", False),
+        ("user@", False),
+    ])
+    def test_validate_email(self, email, ok):
+        """Testa validação de email."""
+        assert validate_email(email) is ok
 
-    def test_validate_email_valid(self):
-        """Testa validação de email válido."""
-        assert validate_email("user@example.com") is True
-        assert validate_email("john.doe@example.co.uk") is True
+    @pytest.mark.parametrize("region,regions,ok", [
+        ("RS", ["RS", "SP", "MG"], True),
+        ("sp", ["RS", "SP", "MG"], True),  # Case insensitive
+        ("mg", frozenset({"RS", "SP", "MG"}), True),  # Frozenset do settings
+        ("rs", frozenset({"rs", "sp"}), True),  # Frozenset em minúsculas
+        ("RS", ("rs", "sp"), True),  # Outras coleções
+        ("BA", ["RS", "SP"], False),
+        ("", ["RS", "SP"], False),
+        (None, ["RS", "SP"], False),
+    ])
+    def test_validate_region(self, region, regions, ok):
+        """Testa validação de região."""
+        assert validate_region(region, regions) is ok
 
-    def test_validate_email_invalid(self):
-        """Testa validação de email inválido."""
-        assert validate_email("invalid") is False
-        assert validate_email("@example.com") is False
-        assert validate_email("user@") is False
+    @pytest.mark.parametrize("horario,ok", [
+        ("09:00", True),  # Início comercial
+        ("14:30", True),  # Meio do dia
+        ("17:59", True),  # Fim comercial
+        ("08:00", False),  # Antes do horário comercial
+        ("18:00", False),  # Após horário comercial
+        ("25:00", False),  # Hora inválida
+        ("14:60", False),  # Minuto inválido
+        ("invalid", False),
+    ])
+    def test_validate_horario(self, horario, ok):
+        """Testa validação de horário."""
+        assert validate_horario(horario) is ok
 
-    def test_validate_region_valid(self):
-        """Testa validação de região válida."""
-        regions = ["RS", "SP", "MG"]
-        assert validate_region("RS", regions) is True
-        assert validate_region("sp", regions) is True  # Case insensitive
-
-    def test_validate_region_invalid(self):
-        """Testa validação de região inválida."""
-        regions = ["RS", "SP"]
-        assert validate_region("BA", regions) is False
-        assert validate_region("", regions) is False
-        assert validate_region(None, regions) is False
-
-    def test_validate_horario_valid(self):
-        """Testa validação de horário válido."""
-        assert validate_horario("09:00") is True  # Início comercial
-        assert validate_horario("14:30") is True  # Meio do dia
-        assert validate_horario("17:59") is True  # Fim comercial
-
-    def test_validate_horario_invalid(self):
-        """Testa validação de horário inválido."""
-        assert validate_horario("08:00") is False  # Antes do horário comercial
-        assert validate_horario("18:00") is False  # Após horário comercial
-        assert validate_horario("25:00") is False  # Hora inválida
-        assert validate_horario("14:60") is False  # Minuto inválido
-        assert validate_horario("invalid") is False
-
-    def test_validate_data_futura_valid(self):
+    @pytest.mark.parametrize("dias,ok", [
+        (1, True),  # Amanhã
+        (-1, False),  # Ontem
+    ])
+    def test_validate_data_futura(self, dias, ok):
         """Testa validação de data futura."""
-        from datetime import datetime, timedelta
-        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
-        assert validate_data_futura(tomorrow) is True
+        data = (datetime.now() + timedelta(days=dias)).strftime("%d/%m/%Y")
+        assert validate_data_futura(data) is ok
 
     def test_validate_data_futura_invalid(self):
-        """Testa validação de data passada."""
-        from datetime import datetime, timedelta
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%d/%m/%Y")
-        assert validate_data_futura(yesterday) is False
+        """Testa validação de data inexistente e referência de "agora"."""
+        assert validate_data_futura("31/02/2099") is False  # Data inexistente
+        assert validate_data_futura("01/01/2030", now=datetime(2030, 1, 2)) is False
 
-    def test_sanitize_text(self):
+    @pytest.mark.parametrize("text,max_length,expected", [
+        ("Hello World", 5000, "Hello World"),  # Texto normal
+        ("Hello\x00World", 5000, "HelloWorld"),  # Com caracteres de controle
+        ("a" * 10000, 100, "a" * 100),  # Limita comprimento
+    ])
+    def test_sanitize_text(self, text, max_length, expected):
         """Testa sanitização de texto."""
-        # Texto normal
-        assert sanitize_text("Hello World") == "Hello World"
-
-        # Com caracteres de controle
-        text_with_control = "Hello\x00World"
-        result = sanitize_text(text_with_control)
-        assert "\x00" not in result
+        assert sanitize_text(text, max_length=max_length) == expected
 
-        # Limita comprimento
-        long_text = "a" * 10000
-        result = sanitize_text(long_text, max_length=100)
-        assert len(result) <= 100
+    @pytest.mark.parametrize("remote_jid,expected", [
+        ("5511999999999@s.whatsapp.net", "5511999999999"),
+        ("5511999999999", "5511999999999"),
+        ("123@s.whatsapp.net", None),  # Muito curto
+        ("00000000000@s.whatsapp.net", None),  # Todos zeros
+        ("", None),
+        (None, None),
+    ])
+    def test_extrair_telefone_whatsapp(self, remote_jid, expected):
+        """Testa extração de telefone do JID."""
+        assert extrair_telefone_whatsapp(remote_jid) == expected